@@ -0,0 +1,311 @@
+"""
+Selection score backtest (월말 리밸런싱)
+- 캐시된 수년치 일봉으로 전 종목·전 월말의 선정 점수를 한 번에 계산 (scoring.py 배점표)
+- 월말마다 세부영역(CANDIDATE_POOLS)별 최고 점수 1종목 선정
+- 다음 기간 수익률, 후보 평균 대비 적중률, 교체율 보고
+
+사용법: python scripts/backtest.py [--period 5y] [--horizon 1]
+"""
+
+import argparse
+import os
+import time
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from candidate_pools import CANDIDATE_POOLS
+from fundamentals import load_fundamentals
+from fx_rates import ticker_currency, to_usd
+from indicators import RSI_PERIOD
+from ohlcv_cache import PERIOD_DAYS, load_history
+from scoring import selection_score
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# 선정 대상이 되려면 필요한 최소 봉 수 (calculate_selection_score와 동일)
+MIN_BARS = 126
+
+# 월말에 거래소 휴장이면 직전 봉을 사용할 최대 일수
+MONTH_END_FILL_DAYS = 5
+
+
+# ============================================================================
+# FEATURES
+# ============================================================================
+
+def _long_history(panel):
+    """(field, ticker) 패널 → 종목별 실제 거래일만 남긴 long 포맷 (ticker, date 순)"""
+    close = panel['Close']
+    long = pd.DataFrame({
+        'Close': close.unstack(),
+        'Volume': panel['Volume'].reindex(columns=close.columns).unstack(),
+    })
+    long.index = long.index.set_names(['ticker', 'date'])
+    return long.dropna(subset=['Close']).sort_index()
+
+
+def historical_indicators(panel):
+    """
+    전 종목·전 거래일 지표 (종목별 자기 거래일 기준 창) → long DataFrame
+    - indicators.compute_indicators와 같은 식 (RSI: Wilder)
+    """
+    long = _long_history(panel)
+    by_ticker = long.groupby(level='ticker', sort=False)
+    close = long['Close']
+    volume = long['Volume']
+
+    result = pd.DataFrame(index=long.index)
+    result['close'] = close
+    result['bars'] = by_ticker.cumcount() + 1
+    result['return_3m'] = (close / by_ticker['Close'].shift(62) - 1) * 100
+    result['return_6m'] = (close / by_ticker['Close'].shift(125) - 1) * 100
+
+    def rolling_mean(series, window):
+        return series.groupby(level='ticker', sort=False).rolling(window).mean().droplevel(0)
+
+    ma_20 = rolling_mean(close, 20)
+    ma_60 = rolling_mean(close, 60)
+    result['golden_cross'] = ma_20 > ma_60
+    result['price_vs_ma20'] = (close / ma_20 - 1) * 100
+
+    volume_60 = rolling_mean(volume, 60)
+    result['volume_trend'] = np.where(volume_60 > 0, rolling_mean(volume, 20) / volume_60, 1.0)
+
+    delta = by_ticker['Close'].diff()
+    smooth = dict(alpha=1 / RSI_PERIOD, adjust=False)
+    avg_gain = delta.clip(lower=0).where(delta.notna()).groupby(level='ticker', sort=False) \
+        .ewm(**smooth).mean().droplevel(0)
+    avg_loss = (-delta).clip(lower=0).where(delta.notna()).groupby(level='ticker', sort=False) \
+        .ewm(**smooth).mean().droplevel(0)
+    result['rsi'] = 100 - 100 / (1 + avg_gain / avg_loss)
+
+    return result
+
+
+def month_end_dates(index):
+    """거래일 index에서 각 월의 마지막 날짜"""
+    dates = pd.Series(index, index=index)
+    return pd.DatetimeIndex(dates.groupby(index.to_period('M')).max().values)
+
+
+def load_backtest_data(period='5y', horizon=1, offline=False):
+    """
+    백테스트 입력 준비 → dict
+    - tickers: 종목 순서 (배열의 열)
+    - dates: 리밸런싱 월말 (배열의 행, 마지막 horizon개월은 수익률이 없어 제외)
+    - features: {이름: (월말 x 종목) 배열}, eligible: 선정 가능 여부, forward: 다음 horizon개월 수익률
+    """
+    tickers = list(dict.fromkeys(c['ticker'] for pool in CANDIDATE_POOLS.values() for c in pool))
+    panel, failed = load_history(tickers, period=period, offline=offline)
+    tickers = [ticker for ticker in tickers if ticker not in failed]
+
+    long = historical_indicators(panel)
+
+    def wide(column):
+        frame = long[column].unstack(level='ticker').reindex(columns=tickers)
+        frame = frame.reindex(panel.index).ffill(limit=MONTH_END_FILL_DAYS)
+        return frame.loc[month_ends]
+
+    month_ends = month_end_dates(panel.index)
+    close = wide('close')
+
+    # 과거 시가총액: 현재 상장주식수 x 당시 종가 (없으면 현재 시가총액 고정)
+    # 달러 환산은 현재 환율 (과거 환율 변동은 반영하지 않음)
+    fundamentals, _ = load_fundamentals(tickers)
+    shares = pd.Series({t: fundamentals.get(t, {}).get('shares_outstanding') for t in tickers}, dtype=float)
+    market_cap_now = pd.Series({t: fundamentals.get(t, {}).get('market_cap') for t in tickers}, dtype=float)
+    market_cap = (close * shares).fillna(pd.DataFrame(
+        np.broadcast_to(market_cap_now.to_numpy(), close.shape), index=close.index, columns=tickers
+    ))
+    currencies = {t: ticker_currency(t, fundamentals.get(t, {}).get('currency')) for t in tickers}
+    market_cap = to_usd(market_cap, currencies).fillna(0)
+
+    forward = (close.shift(-horizon) / close - 1) * 100
+    keep = slice(None, -horizon if horizon else None)
+
+    features = {
+        'market_cap': market_cap.to_numpy()[keep],
+        'volume_trend': wide('volume_trend').to_numpy(dtype=float)[keep],
+        'return_3m': wide('return_3m').to_numpy(dtype=float)[keep],
+        'return_6m': wide('return_6m').to_numpy(dtype=float)[keep],
+        'golden_cross': wide('golden_cross').fillna(False).to_numpy(dtype=bool)[keep],
+        'rsi': wide('rsi').to_numpy(dtype=float)[keep],
+        'price_vs_ma20': wide('price_vs_ma20').to_numpy(dtype=float)[keep],
+    }
+    eligible = (wide('bars').to_numpy(dtype=float) >= MIN_BARS)[keep]
+
+    return {
+        'tickers': tickers,
+        'dates': month_ends[keep],
+        'features': features,
+        'eligible': eligible,
+        'forward': forward.to_numpy(dtype=float)[keep],
+        'failed': failed,
+    }
+
+
+# ============================================================================
+# SELECTION & EVALUATION
+# ============================================================================
+
+def sector_columns(tickers):
+    """{세부영역: 후보 열 번호 배열} (데이터 없는 후보 제외, 후보 순서 유지)"""
+    position = {ticker: i for i, ticker in enumerate(tickers)}
+    return {
+        sub_sector: np.array([position[c['ticker']] for c in pool if c['ticker'] in position], dtype=int)
+        for sub_sector, pool in CANDIDATE_POOLS.items()
+    }
+
+
+def pick_per_sector(scores, eligible, columns):
+    """
+    세부영역별 최고 점수 종목 열 번호 (선정 불가면 -1)
+    - scores: (..., 월말, 종목) 배열 → 반환: {세부영역: (..., 월말) 배열}
+    - 동점이면 후보 순서가 앞선 종목 (calculate_selection_score 정렬과 동일)
+    """
+    masked = np.where(eligible, scores, -np.inf)
+    picks = {}
+    for sub_sector, cols in columns.items():
+        if len(cols) == 0:
+            picks[sub_sector] = np.full(scores.shape[:-1], -1)
+            continue
+        sector_scores = masked[..., cols]
+        best = np.argmax(sector_scores, axis=-1)
+        valid = np.isfinite(np.take_along_axis(sector_scores, best[..., None], axis=-1))[..., 0]
+        picks[sub_sector] = np.where(valid, cols[best], -1)
+    return picks
+
+
+def nanmean(values, axis=-1):
+    """NaN 제외 평균 (전부 NaN이면 경고 없이 NaN)"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nanmean(values, axis=axis)
+
+
+def sector_metrics(picks, forward, eligible, columns):
+    """
+    세부영역별 (..., 지표) 배열 → 평균 수익률, 후보 평균, 초과 수익, 적중률, 상승 비율, 교체율, 월 수
+    - 적중: 선정 종목 수익률 > 같은 세부영역 선정 가능 후보 평균
+    """
+    metrics = {}
+    for sub_sector, pick in picks.items():
+        cols = columns[sub_sector]
+        valid = pick >= 0
+        pick_return = np.take_along_axis(
+            np.broadcast_to(forward, pick.shape + forward.shape[-1:]),
+            np.where(valid, pick, 0)[..., None], axis=-1
+        )[..., 0]
+        pick_return = np.where(valid, pick_return, np.nan)
+
+        pool_return = nanmean(np.where(eligible[..., cols], forward[..., cols], np.nan))
+        pool_return = np.where(valid, np.broadcast_to(pool_return, pick_return.shape), np.nan)
+
+        months = valid.sum(axis=-1)
+        both = valid[..., 1:] & valid[..., :-1]
+        changed = (pick[..., 1:] != pick[..., :-1]) & both
+        avg_return = nanmean(pick_return)
+
+        metrics[sub_sector] = {
+            'months': months,
+            'avg_return': avg_return,
+            'pool_return': nanmean(pool_return),
+            'excess': avg_return - nanmean(pool_return),
+            'hit_rate': (pick_return > pool_return).sum(axis=-1) / np.maximum(months, 1) * 100,
+            'positive_rate': (pick_return > 0).sum(axis=-1) / np.maximum(months, 1) * 100,
+            'turnover': changed.sum(axis=-1) / np.maximum(both.sum(axis=-1), 1) * 100,
+            'returns': pick_return,
+        }
+    return metrics
+
+
+def portfolio_returns(metrics):
+    """세부영역 선정 종목 동일가중 포트폴리오의 월별 수익률 (..., 월말), 선정 종목이 없는 월은 NaN"""
+    return nanmean(np.stack([m['returns'] for m in metrics.values()], axis=-1))
+
+
+def run_backtest(data, scores=None):
+    """(세부영역별 결과 DataFrame, 포트폴리오 요약 dict)"""
+    if scores is None:
+        scores = selection_score(**data['features'])
+    columns = sector_columns(data['tickers'])
+    picks = pick_per_sector(scores, data['eligible'], columns)
+    metrics = sector_metrics(picks, data['forward'], data['eligible'], columns)
+
+    rows = []
+    for sub_sector, m in metrics.items():
+        last = picks[sub_sector][-1] if len(picks[sub_sector]) else -1
+        rows.append({
+            'sub_sector': sub_sector,
+            'months': int(m['months']),
+            'avg_return': m['avg_return'],
+            'pool_return': m['pool_return'],
+            'excess': m['excess'],
+            'hit_rate': m['hit_rate'],
+            'positive_rate': m['positive_rate'],
+            'turnover': m['turnover'],
+            'last_pick': data['tickers'][last] if last >= 0 else '',
+        })
+
+    monthly = portfolio_returns(metrics)
+    universe = nanmean(np.where(data['eligible'], data['forward'], np.nan))
+    summary = {
+        'months': int(np.isfinite(monthly).sum()),
+        'avg_return': float(np.nanmean(monthly)),
+        'universe_return': float(np.nanmean(universe)),
+        'cumulative': float((np.nanprod(1 + monthly / 100) - 1) * 100),
+        'hit_rate': float((monthly > universe)[np.isfinite(monthly)].mean() * 100),
+    }
+    return pd.DataFrame(rows), summary
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='선정 점수 월말 리밸런싱 백테스트')
+    parser.add_argument('--period', default='5y', choices=list(PERIOD_DAYS))
+    parser.add_argument('--horizon', type=int, default=1, help='보유 기간 (개월)')
+    parser.add_argument('--offline', action='store_true', help='캐시된 일봉만 사용')
+    args = parser.parse_args()
+
+    print("="*80)
+    print("🧪 선정 점수 백테스트")
+    print("="*80 + "\n")
+
+    start = time.perf_counter()
+    data = load_backtest_data(args.period, args.horizon, offline=args.offline)
+    loaded = time.perf_counter()
+    table, summary = run_backtest(data)
+    done = time.perf_counter()
+
+    print(f"📋 종목 {len(data['tickers'])}개, 월말 {len(data['dates'])}개 "
+          f"({data['dates'][0]:%Y-%m} ~ {data['dates'][-1]:%Y-%m}), 보유 {args.horizon}개월")
+    if data['failed']:
+        print(f"⚠️ 데이터 없음: {', '.join(data['failed'])}")
+    print(f"⏱️ 데이터 준비 {loaded - start:.2f}초, 백테스트 {done - loaded:.3f}초\n")
+
+    pd.set_option('display.width', 200)
+    print(table.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+
+    print(f"\n📊 포트폴리오 (세부영역 1위 동일가중, {summary['months']}개월)")
+    print(f"   월평균 수익률: {summary['avg_return']:+.2f}% (전체 후보 평균 {summary['universe_return']:+.2f}%)")
+    print(f"   누적 수익률: {summary['cumulative']:+.2f}%")
+    print(f"   후보 평균 대비 적중률: {summary['hit_rate']:.1f}%")
+
+    output_dir = 'outputs'
+    os.makedirs(output_dir, exist_ok=True)
+    output_file = f"{output_dir}/backtest_{datetime.now().strftime('%Y%m%d')}.csv"
+    table.to_csv(output_file, index=False, encoding='utf-8-sig')
+    print(f"\n📁 결과 파일 저장: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Candidate universe for stock selection
+- 세부영역별 후보 종목 Pool과 대분류/중분류 매핑
+- 데이터 파일에서 로드: data/universe.csv (sub_sector, ticker, name, exchange),
+  data/sectors.csv (sub_sector, category, sector)
+- 큰 후보군은 UNIVERSE_FILE 환경변수로 다른 파일 지정
+- 종목 선정(stock_selection_system), 스크리닝, 백테스트가 함께 사용
+"""
+
+import csv
+import os
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+UNIVERSE_FILE = os.environ.get('UNIVERSE_FILE', os.path.join(DATA_DIR, 'universe.csv'))
+SECTORS_FILE = os.environ.get('SECTORS_FILE', os.path.join(DATA_DIR, 'sectors.csv'))
+
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def _read_rows(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return [{key: (value or '').strip() for key, value in row.items()} for row in csv.DictReader(f)]
+
+
+def load_sector_mapping(path=SECTORS_FILE):
+    """{세부영역: {'category', 'sector'}}"""
+    return {
+        row['sub_sector']: {'category': row['category'], 'sector': row['sector']}
+        for row in _read_rows(path)
+    }
+
+
+def load_candidate_pools(path=UNIVERSE_FILE, sector_mapping=None):
+    """
+    {세부영역: [{'name', 'ticker', 'exchange'}]} (파일 순서 유지)
+    - 매핑에 없는 세부영역이나 같은 세부영역 안의 중복 종목은 건너뜀
+    """
+    pools = {}
+    for row in _read_rows(path):
+        sub_sector = row['sub_sector']
+        if not row['ticker'] or (sector_mapping is not None and sub_sector not in sector_mapping):
+            continue
+        pool = pools.setdefault(sub_sector, [])
+        if any(c['ticker'] == row['ticker'] for c in pool):
+            continue
+        pool.append({'name': row['name'] or row['ticker'], 'ticker': row['ticker'],
+                     'exchange': row['exchange'] or 'US'})
+    return pools
+
+
+# 세부영역과 대분류/중분류 매핑
+SECTOR_MAPPING = load_sector_mapping()
+
+# 각 세부영역별 후보 종목 Pool
+CANDIDATE_POOLS = load_candidate_pools(sector_mapping=SECTOR_MAPPING)
@@ -3,19 +3,27 @@ Datacenter News Monitor v10.4 - WITH TRANSLATION
 ✅ v10.3 기반 + 네이버 파파고 번역
 """
 
-import yfinance as yf
-import requests
 import os
-import json
+import sqlite3
+import threading
 from datetime import datetime, timedelta
-import time
 import warnings
-from collections import defaultdict
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from docx import Document
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-import feedparser
 from urllib.parse import quote
 import re
+import heapq
+
+import http_client
+from seen_links_store import SeenLinkStore
+from translation_cache import TranslationCache
+from keyword_matcher import KeywordMatcher
+from news_dedup import MinHashIndex, cluster_articles
+from news_pipeline import new_timings, run_pipeline
+from feed_cache import FeedCache, fetch_feed
+import telegram_delivery
 
 warnings.filterwarnings('ignore')
 
@@ -29,6 +37,9 @@ TELEGRAM_CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID')
 NAVER_CLIENT_ID = os.environ.get('NAVER_CLIENT_ID', '')
 NAVER_CLIENT_SECRET = os.environ.get('NAVER_CLIENT_SECRET', '')
 
+# 동시 수집 스레드 수 (호스트별 속도 제한은 rate_limit.HOST_RATE_LIMITS)
+COLLECTION_WORKERS = int(os.environ.get('NEWS_COLLECTION_WORKERS', '8'))
+
 STOCKS = [
     {'name': 'NVIDIA', 'ticker': 'NVDA', 'priority': 1, 'country': 'US', 
      'search_terms': ['NVIDIA AI', 'NVIDIA datacenter']},
@@ -67,30 +78,58 @@ KOREAN_KEYWORDS = {
 # TRANSLATION - NAVER PAPAGO
 # ============================================================================
 
-def translate_with_papago(text, max_length=4900):
-    """
-    네이버 파파고로 영문 → 한글 번역
-    실패 시 원문 반환 (안전)
-    """
-    if not text or len(text.strip()) == 0:
-        return text
+_translation_cache = None
+
+
+def get_translation_cache():
+    """Open the on-disk translation cache once per run (None if unavailable)"""
+    global _translation_cache
     
-    # 이미 한글이면 번역 안 함
-    korean_chars = sum(1 for c in text if '가' <= c <= '힣')
-    if len(text) > 0 and korean_chars / len(text) > 0.3:
-        return text
+    if _translation_cache is None:
+        try:
+            _translation_cache = TranslationCache()
+        except sqlite3.Error:
+            _translation_cache = False
+    return _translation_cache or None
+
+
+def close_translation_cache():
+    """Flush LRU bookkeeping and close; later lookups skip the cache"""
+    global _translation_cache
     
-    # Naver API 키 없으면 원문 반환
-    if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
-        return text
+    if _translation_cache:
+        _translation_cache.close()
+    _translation_cache = False
+
+
+PAPAGO_URL = "https://openapi.naver.com/v1/papago/n2mt"
+
+# 파파고는 5000자 제한 (배치 요청도 합친 길이 기준)
+PAPAGO_MAX_CHARS = 4900
+
+# 배치 요청 시 세그먼트 구분자 (세그먼트 내부 줄바꿈은 공백으로 치환)
+SEGMENT_DELIMITER = "\n"
+
+
+def needs_translation(text):
+    """False for empty text or text that is already mostly Korean"""
+    if not text or len(text.strip()) == 0:
+        return False
     
+    korean_chars = sum(1 for c in text if '가' <= c <= '힣')
+    return korean_chars / len(text) <= 0.3
+
+
+def truncate_for_papago(text, max_length):
+    text = text.strip()
+    if len(text) > max_length:
+        text = text[:max_length-3] + "..."
+    return text
+
+
+def request_papago(text):
+    """Single Papago call, returns translated text or None"""
     try:
-        # 파파고는 5000자 제한
-        text = text.strip()
-        if len(text) > max_length:
-            text = text[:max_length-3] + "..."
-        
-        url = "https://openapi.naver.com/v1/papago/n2mt"
         headers = {
             "X-Naver-Client-Id": NAVER_CLIENT_ID,
             "X-Naver-Client-Secret": NAVER_CLIENT_SECRET,
@@ -102,20 +141,103 @@ def translate_with_papago(text, max_length=4900):
             "text": text
         }
         
-        response = requests.post(url, headers=headers, data=data, timeout=10)
+        response = http_client.post(PAPAGO_URL, headers=headers, data=data)
         
         if response.status_code == 200:
             result = response.json()
             translated = result.get('message', {}).get('result', {}).get('translatedText', '')
             if translated and len(translated.strip()) > 0:
                 return translated
+    except Exception:
+        pass
+    
+    return None
+
+
+def translate_with_papago(text, max_length=4900):
+    """
+    네이버 파파고로 영문 → 한글 번역
+    캐시에 있으면 네트워크 호출 없이 반환
+    실패 시 원문 반환 (안전)
+    """
+    return translate_batch_with_papago([(text, max_length)])[0]
+
+
+def translate_batch_with_papago(items):
+    """
+    Translate [(text, max_length), ...] with as few Papago calls as possible
+    - 캐시 확인 후 남은 세그먼트를 5000자 한도 안에서 줄 단위로 묶어 요청
+    - 응답 줄 수가 세그먼트 수와 다르면 해당 묶음만 개별 번역으로 재시도
+    - 요청 자체가 실패하면 재시도 없이 해당 묶음은 원문 (개별 요청으로 쪼개면 실패 요청만 늘고 한도 소진)
+    - 실패한 항목은 원문 반환 (안전)
+    """
+    results = [text for text, _ in items]
+    cache = get_translation_cache()
+    pending = []
+    
+    for idx, (text, max_length) in enumerate(items):
+        if not needs_translation(text):
+            continue
         
-        # 번역 실패 시 원문 반환
-        return text
+        if cache:
+            cached = cache.get(text, 'en', 'ko', max_length)
+            if cached is not None:
+                results[idx] = cached
+                continue
         
-    except Exception as e:
-        # 에러 시에도 원문 반환 (안전)
-        return text
+        # Naver API 키 없으면 원문 반환
+        if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
+            continue
+        
+        # 구분자와 겹치지 않도록 세그먼트 내부 줄바꿈 제거
+        prepared = ' '.join(truncate_for_papago(text, max_length).split())
+        results[idx] = prepared
+        pending.append((idx, prepared))
+    
+    if not pending:
+        return results
+    
+    batches = []
+    batch, batch_len = [], 0
+    for idx, prepared in pending:
+        added = len(prepared) + (len(SEGMENT_DELIMITER) if batch else 0)
+        if batch and batch_len + added > PAPAGO_MAX_CHARS:
+            batches.append(batch)
+            batch, batch_len = [], 0
+            added = len(prepared)
+        batch.append((idx, prepared))
+        batch_len += added
+    if batch:
+        batches.append(batch)
+    
+    for batch in batches:
+        translated = request_papago(SEGMENT_DELIMITER.join(prepared for _, prepared in batch))
+        if translated is None:
+            continue
+        lines = [line.strip() for line in translated.split(SEGMENT_DELIMITER)]
+        lines = [line for line in lines if line]
+        
+        if len(batch) > 1 and len(lines) != len(batch):
+            # 세그먼트 경계가 깨진 경우 개별 번역 (요청이 실패하면 나머지는 원문)
+            lines = []
+            for _, prepared in batch:
+                line = request_papago(prepared)
+                if line is None:
+                    break
+                lines.append(line)
+        elif len(batch) == 1:
+            lines = [translated]
+        
+        for (idx, prepared), line in zip(batch, lines):
+            if not line:
+                continue
+            results[idx] = line
+            # 성공한 번역만 캐시 (실패 시 다음 실행에서 재시도)
+            if cache:
+                text, max_length = items[idx]
+                cache.set(text, 'en', 'ko', max_length, line)
+    
+    return results
 
 
 # ============================================================================
@@ -123,55 +245,72 @@ def translate_with_papago(text, max_length=4900):
 # ============================================================================
 
 def load_seen_links():
-    """Load previously seen news links"""
-    try:
-        with open('news_history.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return set(data.get('seen_links', []))
-    except:
-        return set()
+    """Open the seen-link store and drop links older than the retention window"""
+    store = SeenLinkStore()
+    store.import_legacy_json()
+    store.evict_expired()
+    return store
 
 
-def save_seen_links(links):
-    """Save seen news links"""
+def save_seen_links(store):
+    """Persist links first seen in this run"""
     try:
-        data = {
-            'last_updated': datetime.now().isoformat(),
-            'seen_links': list(links)
-        }
-        with open('news_history.json', 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-    except:
+        store.close()
+    except sqlite3.Error:
         pass
 
 
-def calculate_score(title, keywords_dict):
-    """Calculate relevance score"""
-    text = title.lower()
-    score = 0
-    matched_keywords = []
-    
-    for keyword in keywords_dict.get('high', []):
-        if keyword.lower() in text:
-            score += 10
-            matched_keywords.append(keyword)
-            break
-    
-    if score == 0:
-        for keyword in keywords_dict.get('medium', []):
-            if keyword.lower() in text:
-                score += 6
-                matched_keywords.append(keyword)
-                break
-    
-    return max(score, 1), matched_keywords
+_keyword_matchers = {}
+
+
+def get_keyword_matcher(keywords_dict):
+    """Compiled matcher for a keyword dict (built once per dict)"""
+    entry = _keyword_matchers.get(id(keywords_dict))
+    if entry is None or entry[0] is not keywords_dict:
+        entry = (keywords_dict, KeywordMatcher(keywords_dict))
+        _keyword_matchers[id(keywords_dict)] = entry
+    return entry[1]
+
+
+def calculate_score(title, keywords_dict, description=''):
+    """Calculate relevance score (title + description, all matched keywords)"""
+    return get_keyword_matcher(keywords_dict).score(title, description)
 
 
 # ============================================================================
 # NEWS COLLECTION
 # ============================================================================
 
-def get_google_news_rss(search_term, seen_links):
+_feed_cache = None
+_feed_cache_lock = threading.Lock()
+
+
+def get_feed_cache():
+    """Open the conditional-GET feed cache once per run (None if unavailable)"""
+    global _feed_cache
+    
+    if _feed_cache is None:
+        # 수집 스레드들이 동시에 처음 호출해도 한 번만 생성
+        with _feed_cache_lock:
+            if _feed_cache is None:
+                try:
+                    _feed_cache = FeedCache()
+                except sqlite3.Error:
+                    _feed_cache = False
+    return _feed_cache or None
+
+
+def close_feed_cache():
+    """Close the feed cache; later lookups fetch without conditional GET"""
+    global _feed_cache
+    
+    with _feed_cache_lock:
+        if _feed_cache:
+            _feed_cache.close()
+        _feed_cache = False
+
+
+def get_google_news_rss(search_term):
     """Collect news using Google News RSS"""
     news_list = []
     
@@ -179,23 +318,21 @@ def get_google_news_rss(search_term, seen_links):
         encoded_term = quote(search_term)
         rss_url = f"https://news.google.com/rss/search?q={encoded_term}&hl=en-US&gl=US&ceid=US:en"
         
-        feed = feedparser.parse(rss_url)
+        # 변경 없는 피드는 304 → 저장된 항목 사용 (파싱 생략)
+        entries = fetch_feed(rss_url, get_feed_cache())
         
-        if not feed.entries:
+        if not entries:
             return []
         
         week_ago = datetime.now() - timedelta(days=7)
         
-        for entry in feed.entries[:20]:
+        for entry in entries[:20]:
             try:
                 title = entry.get('title', '').strip()
                 link = entry.get('link', '').strip()
                 
                 if not title or not link or len(title) < 10:
                     continue
-                    
-                if link in seen_links:
-                    continue
                 
                 published = entry.get('published_parsed')
                 if published:
@@ -223,7 +360,6 @@ def get_google_news_rss(search_term, seen_links):
                     'date': pub_date,
                     'source': 'Google News'
                 })
-                seen_links.add(link)
                 
             except:
                 continue
@@ -234,20 +370,7 @@ def get_google_news_rss(search_term, seen_links):
     return news_list
 
 
-def get_us_news(search_terms, seen_links):
-    """Get US company news - Google News only"""
-    all_news = []
-    
-    for term in search_terms[:2]:
-        news = get_google_news_rss(term, seen_links)
-        all_news.extend(news)
-        print(f"      [{term}] {len(news)} articles")
-        time.sleep(1)
-    
-    return all_news
-
-
-def get_naver_news(search_term, seen_links):
+def get_naver_news(search_term):
     """Get Korean news from Naver API"""
     news_list = []
     
@@ -266,7 +389,7 @@ def get_naver_news(search_term, seen_links):
             "sort": "date"
         }
         
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = http_client.get(url, headers=headers, params=params)
         
         if response.status_code != 200:
             return []
@@ -281,9 +404,6 @@ def get_naver_news(search_term, seen_links):
                 
                 if not title or not link or len(title) < 10:
                     continue
-                    
-                if link in seen_links:
-                    continue
                 
                 try:
                     pub_date_str = item.get('pubDate', '')
@@ -310,7 +430,6 @@ def get_naver_news(search_term, seen_links):
                     'date': pub_date,
                     'source': 'Naver API'
                 })
-                seen_links.add(link)
                 
             except:
                 continue
@@ -321,6 +440,42 @@ def get_naver_news(search_term, seen_links):
     return news_list
 
 
+def build_collection_tasks(stocks):
+    """List (stock, search_term, fetcher) in STOCKS order"""
+    tasks = []
+    
+    for stock in stocks:
+        if stock['country'] == 'US':
+            # US 기업은 Google News, 검색어 2개까지
+            terms = stock.get('search_terms', [])[:2]
+            fetcher = get_google_news_rss
+        else:
+            terms = stock.get('search_terms', [stock['name']])
+            fetcher = get_naver_news
+        
+        for term in terms:
+            tasks.append((stock, term, fetcher))
+    
+    return tasks
+
+
+def fetch_stage(stocks, context):
+    """
+    First stage: fan out every search term, yield (stock, [(term, fetcher, items)])
+    - 모든 검색어를 한 번에 제출하고, 종목 순서대로 완료되는 즉시 내보냄
+    - 호스트별 속도 제한은 http_client(rate_limit)에서 처리
+    """
+    stocks = list(stocks)
+    executor = context['fetch_executor']
+    tasks = build_collection_tasks(stocks)
+    futures = [executor.submit(fetcher, term) for _, term, fetcher in tasks]
+    
+    for stock in stocks:
+        yield stock, [(term, fetcher, future.result())
+                      for (task_stock, term, fetcher), future in zip(tasks, futures)
+                      if task_stock is stock]
+
+
 # ============================================================================
 # OUTPUT GENERATION
 # ============================================================================
@@ -375,176 +530,182 @@ def create_docx_report(news_by_company, filename='outputs/news_report.docx'):
 
 def send_telegram_message(text):
     """Send text message to Telegram"""
-    try:
-        url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-        response = requests.post(url, data={"chat_id": TELEGRAM_CHAT_ID, "text": text}, timeout=10)
-        return response.status_code == 200
-    except:
-        return False
+    result = telegram_delivery.deliver(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID,
+                                       'sendMessage', {'text': text})
+    return result['ok']
 
 
 def send_telegram_document(file_path, caption=''):
     """Send document file to Telegram"""
-    try:
-        with open(file_path, 'rb') as f:
-            files = {'document': f}
-            data = {'chat_id': TELEGRAM_CHAT_ID, 'caption': caption}
-            url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendDocument"
-            response = requests.post(url, files=files, data=data, timeout=30)
-            return response.status_code == 200
-    except:
-        return False
+    result = telegram_delivery.deliver(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID,
+                                       'sendDocument', {'caption': caption}, file_path,
+                                       timeout=telegram_delivery.DOCUMENT_TIMEOUT)
+    return result['ok']
 
 
 # ============================================================================
-# MAIN
+# PIPELINE STAGES
 # ============================================================================
+# fetch → normalize → score → dedupe → top-k → translate → render → deliver
+# 종목 단위 배치가 흘러가며, 각 스테이지는 (stock, articles)를 받아 내보냄
 
-def main():
-    """Main execution"""
-    
-    print("="*70)
-    print("Datacenter News Monitor v10.4 - WITH TRANSLATION")
-    print("  ✅ Stable base (v10.3)")
-    print("  ✅ Naver Papago translation")
-    print("  ✅ Fallback to original if translation fails")
-    print("="*70)
-    
-    print("\n[CONFIG]")
-    print(f"  Telegram: {'✓' if TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID else '✗'}")
-    print(f"  Naver API: {'✓' if NAVER_CLIENT_ID and NAVER_CLIENT_SECRET else '✗'}")
-    print(f"  Translation: {'✓ Enabled' if NAVER_CLIENT_ID and NAVER_CLIENT_SECRET else '✗ Disabled (no API key)'}")
-    
-    seen_links = load_seen_links()
-    print(f"  Seen links: {len(seen_links)}")
-    
-    print("\n" + "="*70)
-    print("PHASE 1: NEWS COLLECTION")
-    print("="*70)
-    
-    all_news_by_company = defaultdict(list)
-    stats = {'google': 0, 'naver': 0}
+TOP_K_PER_COMPANY = 2
+
+
+def normalize_stage(batches, context):
+    """Drop seen links (in STOCKS/term order) and tag company/country"""
+    seen_links = context['seen_links']
+    stats = context['stats']
     
-    for idx, stock in enumerate(STOCKS, 1):
-        print(f"\n[{idx}/{len(STOCKS)}] {stock['name']} ({stock['country']})")
+    for idx, (stock, term_results) in enumerate(batches, 1):
+        print(f"\n[{idx}/{len(context['stocks'])}] {stock['name']} ({stock['country']})")
+        articles = []
         
-        if stock['country'] == 'US':
-            news = get_us_news(stock.get('search_terms', []), seen_links)
-            stats['google'] += len(news)
-        else:
-            news = []
-            for term in stock.get('search_terms', [stock['name']]):
-                naver_news = get_naver_news(term, seen_links)
-                news.extend(naver_news)
-                stats['naver'] += len(naver_news)
-                print(f"      [{term}] {len(naver_news)} articles")
-                time.sleep(0.3)
+        for term, fetcher, news in term_results:
+            fresh = 0
+            for news_item in news:
+                # 이전 실행 + 이번 실행에서 먼저 병합된 링크는 제외
+                if news_item['link'] in seen_links:
+                    continue
+                seen_links.add(news_item['link'])
+                news_item['company'] = stock['name']
+                news_item['country'] = stock['country']
+                articles.append(news_item)
+                fresh += 1
+            
+            stats['google' if fetcher is get_google_news_rss else 'naver'] += fresh
+            print(f"      [{term}] {fresh} articles")
         
+        yield stock, articles
+
+
+def score_stage(batches, context):
+    for stock, articles in batches:
         keywords = KOREAN_KEYWORDS if stock['country'] == 'KR' else ENGLISH_KEYWORDS
+        scores = get_keyword_matcher(keywords).score_batch(
+            [(n['title'], n.get('description', '')) for n in articles]
+        )
         
-        for news_item in news:
-            score, matched = calculate_score(news_item['title'], keywords)
+        for news_item, (score, matched) in zip(articles, scores):
             news_item['score'] = score
             news_item['matched_keywords'] = matched
-            news_item['company'] = stock['name']
-            news_item['country'] = stock['country']
-            all_news_by_company[stock['name']].append(news_item)
-    
-    save_seen_links(seen_links)
-    
-    print("\n" + "="*70)
-    print("COLLECTION STATS")
-    print("="*70)
-    print(f"Google: {stats['google']}")
-    print(f"Naver: {stats['naver']}")
-    print(f"TOTAL: {sum(stats.values())}")
+        
+        yield stock, articles
+
+
+def dedupe_stage(batches, context):
+    """
+    Collapse near-duplicates within a company and against earlier companies
+    - 종목 안에서는 점수가 가장 높은 기사를 대표로 남김
+    - 앞 종목에서 이미 남긴 기사와 같은 기사는 제외 (먼저 나온 종목 우선)
+    """
+    seen_index = context['dedup_index']
     
-    # 상위 2개씩 선택
-    filtered = {}
-    for company, news_list in all_news_by_company.items():
-        news_list.sort(key=lambda x: (x['score'], x['date']), reverse=True)
-        filtered[company] = news_list[:2]
+    for stock, articles in batches:
+        unique = cluster_articles(articles, seen_index=seen_index)
+        context['duplicates'] += len(articles) - len(unique)
+        yield stock, unique
+
+
+def top_k_stage(batches, context):
+    """Keep only the best k articles per company (memory bounded by k)"""
+    k = context.get('top_k', TOP_K_PER_COMPANY)
     
-    final_count = sum(len(n) for n in filtered.values())
-    print(f"Final (top 2 each): {final_count}")
+    for stock, articles in batches:
+        top = heapq.nlargest(k, articles, key=lambda x: (x['score'], x['date']))
+        if top:
+            yield stock, top
+
+
+def _translate_company(articles):
+    """Translate one company's top-k in place (US articles only)"""
+    segments = []
+    targets = []
     
-    if final_count == 0:
-        msg = f"📰 데이터센터 뉴스\n\n뉴스 없음\n\nGoogle: {stats['google']}\nNaver: {stats['naver']}"
-        send_telegram_message(msg)
-        return
+    for news in articles:
+        news['translated_title'] = news['title']
+        news['translated_description'] = news.get('description', '')
+        
+        # 영문 기사(US 기업)만 번역, 한글 기사는 원문 사용
+        if news['country'] == 'US' and NAVER_CLIENT_ID and NAVER_CLIENT_SECRET:
+            segments.append((news['title'], 300))
+            targets.append((news, 'translated_title'))
+            
+            if news.get('description'):
+                segments.append((news['description'], 200))
+                targets.append((news, 'translated_description'))
     
-    # ============================================================================
-    # PHASE 2: TRANSLATION (NEW!)
-    # ============================================================================
+    if segments:
+        for (news, field), translated in zip(targets, translate_batch_with_papago(segments)):
+            news[field] = translated
     
-    print("\n" + "="*70)
-    print("PHASE 2: TRANSLATION")
-    print("="*70)
+    return len({id(news) for news, _ in targets})
+
+
+def translate_stage(batches, context):
+    """
+    Translate each company's top-k on a background worker
+    - 다음 종목 수집/채점이 진행되는 동안 번역 진행, 출력 순서는 유지
+    """
+    executor = context['translate_executor']
+    pending = deque()
     
-    if NAVER_CLIENT_ID and NAVER_CLIENT_SECRET:
-        translation_count = 0
-        
-        for company, news_list in filtered.items():
-            print(f"\n[{company}]")
-            for idx, news in enumerate(news_list, 1):
-                # 영문 기사만 번역 (US 기업)
-                if news['country'] == 'US':
-                    print(f"  [{idx}] Translating title...")
-                    news['translated_title'] = translate_with_papago(news['title'], 300)
-                    
-                    if news.get('description'):
-                        print(f"  [{idx}] Translating description...")
-                        news['translated_description'] = translate_with_papago(news['description'], 200)
-                    
-                    translation_count += 1
-                    time.sleep(0.5)  # 파파고 API 속도 제한 고려
-                else:
-                    # 한글 기사는 번역 안 함
-                    news['translated_title'] = news['title']
-                    news['translated_description'] = news.get('description', '')
-        
-        print(f"\nTranslated: {translation_count} articles")
-    else:
-        print("  Translation disabled (no Naver API key)")
-        # 번역 없이 원문 사용
-        for company, news_list in filtered.items():
-            for news in news_list:
-                news['translated_title'] = news['title']
-                news['translated_description'] = news.get('description', '')
+    for stock, articles in batches:
+        pending.append((stock, articles, executor.submit(_translate_company, articles)))
+        
+        while pending and pending[0][2].done():
+            stock_done, articles_done, future = pending.popleft()
+            context['translated'] += future.result()
+            yield stock_done, articles_done
+    
+    while pending:
+        stock_done, articles_done, future = pending.popleft()
+        context['translated'] += future.result()
+        yield stock_done, articles_done
+
+
+def render_company_section(company, news_list):
+    """Telegram text section for one company"""
+    flag = "🇰🇷" if news_list[0]['country'] == 'KR' else "🇺🇸"
+    section = f"{flag} {company}\n{'-'*30}\n\n"
+    
+    for news in news_list:
+        emoji = "🔥" if news['score'] >= 10 else "📈"
+        hours = int((datetime.now() - news['date']).total_seconds() / 3600)
+        time_str = "방금" if hours < 1 else f"{hours}시간 전" if hours < 24 else f"{hours//24}일 전"
+        
+        # 번역된 제목 사용 (없으면 원본)
+        title_text = news.get('translated_title', news['title'])
+        section += f"{emoji} {title_text}\n\n"
+        
+        # 번역된 설명 사용 (있으면)
+        if news.get('translated_description') and len(news['translated_description'].strip()) > 0:
+            section += f"{news['translated_description']}\n\n"
+        
+        section += f"⏰ {time_str} | 📰 {news['publisher']}\n"
+        section += f"🔗 {news['link']}\n\n"
     
-    print("\n" + "="*70)
-    print("PHASE 3: MESSAGE GENERATION")
-    print("="*70)
+    section += "="*30 + "\n\n"
+    return section
+
+
+def render_stage(batches, context):
+    for stock, articles in batches:
+        yield stock, articles, render_company_section(stock['name'], articles)
+
+
+def build_messages(rendered, stats):
+    """Pack company sections (highest score first) into <=3500-char messages"""
+    final_count = sum(len(articles) for _, articles, _ in rendered)
     
     messages = []
     msg = f"📰 데이터센터 뉴스\n{datetime.now().strftime('%Y-%m-%d %H:%M')}\n{'='*30}\n\n"
     msg += f"📊 기사: {final_count}개\n"
     msg += f"Google: {stats['google']} | Naver: {stats['naver']}\n\n"
     
-    for company, news_list in sorted(filtered.items(), 
-                                    key=lambda x: max(n['score'] for n in x[1]), 
-                                    reverse=True):
-        flag = "🇰🇷" if news_list[0]['country'] == 'KR' else "🇺🇸"
-        section = f"{flag} {company}\n{'-'*30}\n\n"
-        
-        for news in news_list:
-            emoji = "🔥" if news['score'] >= 10 else "📈"
-            hours = int((datetime.now() - news['date']).total_seconds() / 3600)
-            time_str = "방금" if hours < 1 else f"{hours}시간 전" if hours < 24 else f"{hours//24}일 전"
-            
-            # 번역된 제목 사용 (없으면 원본)
-            title_text = news.get('translated_title', news['title'])
-            section += f"{emoji} {title_text}\n\n"
-            
-            # 번역된 설명 사용 (있으면)
-            if news.get('translated_description') and len(news['translated_description'].strip()) > 0:
-                section += f"{news['translated_description']}\n\n"
-            
-            section += f"⏰ {time_str} | 📰 {news['publisher']}\n"
-            section += f"🔗 {news['link']}\n\n"
-        
-        section += "="*30 + "\n\n"
-        
+    for _, _, section in sorted(rendered,
+                                key=lambda x: max(n['score'] for n in x[1]),
+                                reverse=True):
         if len(msg + section) > 3500:
             messages.append(msg)
             msg = section
@@ -554,21 +715,136 @@ def main():
     if msg:
         messages.append(msg)
     
+    return messages
+
+
+def deliver(rendered, context):
+    """Sink: build messages and DOCX from all rendered companies, then send"""
+    stats = context['stats']
+    final_count = sum(len(articles) for _, articles, _ in rendered)
+    print(f"\nFinal (top {context.get('top_k', TOP_K_PER_COMPANY)} each): {final_count}")
+    
+    if final_count == 0:
+        msg = f"📰 데이터센터 뉴스\n\n뉴스 없음\n\nGoogle: {stats['google']}\nNaver: {stats['naver']}"
+        send_telegram_message(msg)
+        return
+    
+    messages = build_messages(rendered, stats)
     print(f"Generated {len(messages)} messages")
     
+    filtered = {stock['name']: articles for stock, articles, _ in rendered}
     docx = create_docx_report(filtered, f"outputs/news_{datetime.now().strftime('%Y%m%d')}.docx")
     
     print("\n" + "="*70)
-    print(f"PHASE 4: TELEGRAM DELIVERY")
+    print("TELEGRAM DELIVERY")
+    print("="*70)
+    
+    # 문서는 텍스트 메시지와 병렬 전송, 속도 제한/재시도는 delivery 큐에서 처리
+    delivery = telegram_delivery.TelegramDelivery(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID)
+    for m in messages:
+        delivery.send_message(m)
+    delivery.send_document(docx, '📰 데이터센터 뉴스 리포트', label='DOCX')
+    
+    delivery.print_report(delivery.wait())
+
+
+# STOCKS → ... → deliver 사이의 스테이지 그래프
+# news_pipeline.benchmark_stage로 스테이지 하나씩 측정 가능
+NEWS_PIPELINE = [
+    ('fetch', fetch_stage),
+    ('normalize', normalize_stage),
+    ('score', score_stage),
+    ('dedupe', dedupe_stage),
+    ('top_k', top_k_stage),
+    ('translate', translate_stage),
+    ('render', render_stage),
+]
+
+
+def new_pipeline_context(stocks, seen_links, fetch_executor, translate_executor,
+                         top_k=TOP_K_PER_COMPANY):
+    return {
+        'stocks': stocks,
+        'seen_links': seen_links,
+        'stats': {'google': 0, 'naver': 0},
+        'dedup_index': MinHashIndex(),
+        'duplicates': 0,
+        'top_k': top_k,
+        'fetch_executor': fetch_executor,
+        'translate_executor': translate_executor,
+        'translated': 0,
+    }
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    """Main execution"""
+    
+    print("="*70)
+    print("Datacenter News Monitor v10.4 - WITH TRANSLATION")
+    print("  ✅ Stable base (v10.3)")
+    print("  ✅ Naver Papago translation")
+    print("  ✅ Fallback to original if translation fails")
     print("="*70)
     
-    for idx, m in enumerate(messages, 1):
-        send_telegram_message(m)
-        print(f"  Message {idx}: Sent")
-        time.sleep(1)
+    print("\n[CONFIG]")
+    print(f"  Telegram: {'✓' if TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID else '✗'}")
+    print(f"  Naver API: {'✓' if NAVER_CLIENT_ID and NAVER_CLIENT_SECRET else '✗'}")
+    print(f"  Translation: {'✓ Enabled' if NAVER_CLIENT_ID and NAVER_CLIENT_SECRET else '✗ Disabled (no API key)'}")
+    
+    seen_links = load_seen_links()
+    print(f"  Seen links: {len(seen_links)}")
+    
+    print("\n" + "="*70)
+    print("PIPELINE: " + " → ".join(name.upper() for name, _ in NEWS_PIPELINE) + " → DELIVER")
+    print("="*70)
     
-    send_telegram_document(docx, '📰 데이터센터 뉴스 리포트')
-    print("  DOCX: Sent")
+    try:
+        timings = new_timings()
+        
+        with ThreadPoolExecutor(max_workers=max(1, COLLECTION_WORKERS)) as fetch_executor, \
+             ThreadPoolExecutor(max_workers=1) as translate_executor:
+            context = new_pipeline_context(STOCKS, seen_links, fetch_executor, translate_executor)
+            rendered = list(run_pipeline(STOCKS, NEWS_PIPELINE, context, timings))
+        
+        save_seen_links(seen_links)
+        stats = context['stats']
+        
+        print("\n" + "="*70)
+        print("COLLECTION STATS")
+        print("="*70)
+        print(f"Google: {stats['google']}")
+        print(f"Naver: {stats['naver']}")
+        print(f"TOTAL: {sum(stats.values())}")
+        print(f"Near-duplicates removed: {context['duplicates']}")
+        
+        feed_cache = get_feed_cache()
+        if feed_cache:
+            print(f"Feed cache: {feed_cache.stats['not_modified']} not modified / "
+                  f"{feed_cache.stats['fetched']} fetched")
+        
+        if NAVER_CLIENT_ID and NAVER_CLIENT_SECRET:
+            print(f"Translated: {context['translated']} articles")
+            cache = get_translation_cache()
+            if cache:
+                cache_stats = cache.stats()
+                print(f"Translation cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                      f"({cache_stats['hit_rate']:.0f}%)")
+        else:
+            print("Translation disabled (no Naver API key)")
+        
+        print("\nStage timings:")
+        for name, _ in NEWS_PIPELINE:
+            print(f"  {name:10s} {timings[name]:.3f}s")
+        
+        deliver(rendered, context)
+    finally:
+        # 예외로 중단돼도 캐시 파일 정리 (seen links는 파이프라인이 끝난 경우에만 저장)
+        close_feed_cache()
+        close_translation_cache()
     
     print("\n" + "="*70)
     print("✅ COMPLETE")
@@ -5,14 +5,22 @@
 - 모든 상승/하락 종목 표시
 """
 
-import yfinance as yf
 import pandas as pd
-import requests
 import os
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+from exporter import EXPORT_EXCEL, append_history, write_excel, write_table
+from indicator_state import load_indicators
+from indicators import compute_from_history
+from market_data import get_history, print_fetch_stats
+from ohlcv_cache import update_history
+from sector_analytics import BENCHMARK, SECTOR_WEIGHTING, load_sector_analytics
+from telegram_delivery import TelegramDelivery
+from universe_snapshot import warm_start
+from watchlist import load_watchlist
+
 print("="*70)
 print("📊 데이터센터 투자 자동화 시스템 v2.0")
 print("="*70 + "\n")
@@ -20,106 +28,41 @@ print("="*70 + "\n")
 TELEGRAM_BOT_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN')
 TELEGRAM_CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID')
 
-STOCKS = [
-    {'name': 'NVIDIA', 'ticker': 'NVDA', 'sector': 'AI칩'},
-    {'name': 'AMD', 'ticker': 'AMD', 'sector': 'AI칩'},
-    {'name': 'Intel', 'ticker': 'INTC', 'sector': 'AI칩'},
-    {'name': 'Super Micro', 'ticker': 'SMCI', 'sector': 'AI서버'},
-    {'name': 'Dell', 'ticker': 'DELL', 'sector': 'AI서버'},
-    {'name': 'Vertiv', 'ticker': 'VRT', 'sector': '전력'},
-    {'name': 'Eaton', 'ticker': 'ETN', 'sector': '전력'},
-    {'name': 'LS ELECTRIC', 'ticker': '010120.KS', 'sector': '전력'},
-    {'name': 'Cummins', 'ticker': 'CMI', 'sector': '발전'},
-    {'name': 'Generac', 'ticker': 'GNRC', 'sector': '발전'},
-    {'name': 'Johnson Controls', 'ticker': 'JCI', 'sector': '쿨링'},
-    {'name': 'Trane Tech', 'ticker': 'TT', 'sector': '쿨링'},
-    {'name': 'Arista Networks', 'ticker': 'ANET', 'sector': '네트워크'},
-    {'name': 'Broadcom', 'ticker': 'AVGO', 'sector': '네트워크'},
-    {'name': 'Marvell', 'ticker': 'MRVL', 'sector': '네트워크'},
-    {'name': 'HFR', 'ticker': '230240.KQ', 'sector': '광통신'},
-    {'name': 'Corning', 'ticker': 'GLW', 'sector': '광섬유'},
-    {'name': 'Lumentum', 'ticker': 'LITE', 'sector': '광통신'},
-    {'name': 'SK hynix', 'ticker': '000660.KS', 'sector': 'HBM'},
-    {'name': 'Samsung', 'ticker': '005930.KS', 'sector': 'HBM'},
-    {'name': 'Micron', 'ticker': 'MU', 'sector': 'HBM'},
-    {'name': '한미반도체', 'ticker': '042700.KQ', 'sector': '패키징'},
-    {'name': 'Amkor', 'ticker': 'AMKR', 'sector': '패키징'},
-    {'name': 'Western Digital', 'ticker': 'WDC', 'sector': 'SSD'},
-    {'name': 'Digital Realty', 'ticker': 'DLR', 'sector': 'DC REIT'},
-    {'name': 'Equinix', 'ticker': 'EQIX', 'sector': 'DC REIT'},
-]
+# 월간 종목 선정이 남긴 스냅샷이 있으면 그 종목 목록 사용 + OHLCV 캐시 미리 채우기
+STOCKS, snapshot = load_watchlist()
+if snapshot:
+    warm = warm_start(snapshot)
+    print(f"🗂️ 종목 스냅샷 사용 ({snapshot['created']} 선정): 캐시 채움 {warm['seeded']}개, "
+          f"봉 추가 {warm['appended']}개, 지표 상태 {warm['states']}개")
 
 print(f"📋 총 {len(STOCKS)}개 종목 모니터링\n")
 
 
-def calculate_rsi(prices, period=14):
-    """RSI(Relative Strength Index) 계산"""
-    try:
-        if len(prices) < period:
-            return 50
-        
-        deltas = prices.diff()
-        gain = deltas.where(deltas > 0, 0)
-        loss = -deltas.where(deltas < 0, 0)
-        
-        avg_gain = gain.rolling(window=period).mean()
-        avg_loss = loss.rolling(window=period).mean()
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi.iloc[-1]
-    except:
-        return 50
+REPORT_FIELDS = [
+    'price', 'change_1d', 'change_1w', 'change_1m', 'vs_ma20',
+    'golden_cross', 'dead_cross', 'volume_ratio', 'rsi',
+]
 
 
-def get_stock_data(ticker, name, sector):
-    """주가 데이터 수집 및 지표 계산"""
+def get_stock_data(ticker, name, sector, hist=None, row=None):
+    """
+    주가 데이터 수집 및 지표 계산
+    - row: indicators.compute_indicators 결과 1행 (있으면 계산 생략)
+    - hist: 단일 종목 OHLCV (있으면 다운로드 생략)
+    """
     try:
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period="1y")
-        
-        if hist.empty or len(hist) < 2:
-            return None
-        
-        current = hist['Close'].iloc[-1]
-        prev = hist['Close'].iloc[-2] if len(hist) >= 2 else current
-        
-        # 수익률 계산
-        change_1d = ((current / prev) - 1) * 100
-        change_1w = ((current / hist['Close'].iloc[-5]) - 1) * 100 if len(hist) >= 5 else 0
-        change_1m = ((current / hist['Close'].iloc[-21]) - 1) * 100 if len(hist) >= 21 else 0
+        if row is None:
+            if hist is None:
+                hist = get_history(ticker, period="1y")
+            if hist is None or len(hist) < 2:
+                return None
+            row = compute_from_history(hist)
+            if row is None:
+                return None
         
-        # 이동평균
-        ma_20 = hist['Close'].rolling(20).mean().iloc[-1] if len(hist) >= 20 else current
-        ma_60 = hist['Close'].rolling(60).mean().iloc[-1] if len(hist) >= 60 else current
-        
-        vs_ma20 = ((current / ma_20) - 1) * 100 if ma_20 else 0
-        golden_cross = ma_20 > ma_60 if (ma_20 and ma_60) else False
-        dead_cross = ma_20 < ma_60 if (ma_20 and ma_60) else False
-        
-        # 거래량
-        volume = hist['Volume'].iloc[-1]
-        avg_volume = hist['Volume'].rolling(20).mean().iloc[-1] if len(hist) >= 20 else volume
-        volume_ratio = (volume / avg_volume * 100) if avg_volume else 100
-        
-        # RSI 계산
-        rsi = calculate_rsi(hist['Close'], period=14)
-        
-        return {
-            'name': name,
-            'ticker': ticker,
-            'sector': sector,
-            'price': current,
-            'change_1d': change_1d,
-            'change_1w': change_1w,
-            'change_1m': change_1m,
-            'vs_ma20': vs_ma20,
-            'golden_cross': golden_cross,
-            'dead_cross': dead_cross,
-            'volume_ratio': volume_ratio,
-            'rsi': rsi,
-        }
+        data = {'name': name, 'ticker': ticker, 'sector': sector}
+        data.update({field: row[field] for field in REPORT_FIELDS})
+        return data
     except Exception as e:
         print(f"  ❌ {name}: {str(e)[:50]}")
         return None
@@ -127,20 +70,55 @@ def get_stock_data(ticker, name, sector):
 
 print("📈 주가 데이터 수집 중...\n")
 
+# 전 종목 1년치: 로컬 캐시 + 새로 생긴 봉만 일괄 다운로드
+tickers = [stock['ticker'] for stock in STOCKS]
+failed = update_history(tickers, period="1y")
+
+# 저장된 종목별 지표 상태에 새 봉만 반영 (상태가 없으면 캐시 일봉으로 생성)
+indicators, state_stats = load_indicators(tickers)
+print(f"🧮 지표 상태: 갱신 {state_stats['updated']}개 (새 봉 {state_stats['new_bars']}개), "
+      f"재생성 {state_stats['rebuilt']}개\n")
+
 results = []
 for idx, stock in enumerate(STOCKS, 1):
     print(f"[{idx}/{len(STOCKS)}] {stock['name']:20s} ... ", end='')
-    data = get_stock_data(stock['ticker'], stock['name'], stock['sector'])
+    data = None
+    if stock['ticker'] in indicators.index:
+        data = get_stock_data(stock['ticker'], stock['name'], stock['sector'],
+                              row=indicators.loc[stock['ticker']])
     if data:
         results.append(data)
         print("✅")
     else:
-        print("❌")
+        print(f"❌ {failed.get(stock['ticker'], '캐시/다운로드 데이터 없음')}")
 
 print(f"\n✅ 수집 완료: {len(results)}/{len(STOCKS)}개\n")
 
 df = pd.DataFrame(results)
 
+# 섹터 지수/위험 지표 (캐시된 일봉 패널로 일괄 계산)
+analytics = load_sector_analytics(STOCKS)
+sector_summary = analytics['summary'] if analytics else pd.DataFrame()
+
+# 오늘 결과를 일별 이력에 추가 (Excel은 EXPORT_EXCEL=1일 때만)
+today = datetime.now().strftime('%Y-%m-%d')
+history_file = append_history(df, 'daily_report', today)
+print(f"📁 일별 이력 저장: {history_file}")
+if analytics:
+    sector_file = append_history(sector_summary.reset_index(), 'sector_summary', today)
+    risk_file = write_table(analytics['stocks'].reset_index(), f"outputs/stock_risk_{today.replace('-', '')}")
+    corr_file = write_table(analytics['correlation'].reset_index(), f"outputs/correlation_{today.replace('-', '')}")
+    print(f"📁 섹터 요약/종목 위험 지표/상관계수 저장: {sector_file}, {risk_file}, {corr_file}")
+if EXPORT_EXCEL:
+    sheets = {'일일리포트': (df, False)}
+    if analytics:
+        sheets.update({'섹터요약': (sector_summary.round(2), True),
+                       '종목위험지표': (analytics['stocks'].round(3), True),
+                       '상관계수': (analytics['correlation'].round(2), True)})
+    excel_file = write_excel(f"outputs/daily_report_{today.replace('-', '')}.xlsx", sheets)
+    print(f"📁 Excel 파일 저장: {excel_file}")
+print()
+
 now = datetime.now().strftime('%Y-%m-%d %H:%M')
 
 message = "📊 데이터센터 종목 일일 리포트\n"
@@ -212,6 +190,14 @@ if len(rsi_oversold) > 0:
         message += f"• {row['name']}: RSI {row['rsi']:.1f}\n"
     message += "\n"
 
+# 섹터 요약 (1일 수익률 순)
+if not sector_summary.empty:
+    message += f"🏢 섹터 요약 ({'시총가중' if SECTOR_WEIGHTING == 'cap' else '동일가중'}, β: {BENCHMARK})\n"
+    for sector, row in sector_summary.sort_values('return_1d', ascending=False).iterrows():
+        message += (f"• {sector}: {row['return_1d']:+.2f}% | 1개월 {row['return_1m']:+.1f}% | "
+                    f"변동성 {row['volatility']:.0f}% | MDD {row['max_drawdown']:.0f}% | β {row['beta']:.2f}\n")
+    message += "\n"
+
 up_count = len(df[df['change_1d'] > 0])
 down_count = len(df[df['change_1d'] < 0])
 flat_count = len(df[df['change_1d'] == 0])
@@ -224,17 +210,17 @@ message += f"📊 총 {len(results)}개 종목"
 
 print("📱 텔레그램 전송 중...\n")
 
-url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-payload = {"chat_id": TELEGRAM_CHAT_ID, "text": message}
+delivery = TelegramDelivery(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID)
+delivery.send_message(message, label='일일 리포트')
 
-try:
-    response = requests.post(url, data=payload)
-    if response.status_code == 200:
-        print("✅ 텔레그램 전송 성공!")
+for label, result in delivery.wait():
+    if result['ok']:
+        print(f"✅ 텔레그램 전송 성공! ({result['latency']:.2f}초, {result['attempts']}회 시도)")
     else:
-        print(f"❌ 전송 실패: {response.status_code}")
-except Exception as e:
-    print(f"❌ 오류: {e}")
+        print(f"❌ 전송 실패: {result['status'] or result['error']} ({result['attempts']}회 시도)")
+
+print()
+print_fetch_stats()
 
 print("\n" + "="*70)
 print("✅ 작업 완료!")
@@ -0,0 +1,108 @@
+"""
+Result export (Parquet/CSV 우선, Excel은 요청할 때만)
+- 기본 형식: pyarrow가 있으면 Parquet, 없으면 CSV (EXPORT_FORMAT 환경변수로 지정 가능)
+- 일별 이력: outputs/<이름>_history/YYYY-MM-DD.<형식> (하루 1개 파일, 같은 날 재실행은 덮어씀)
+- Excel: EXPORT_EXCEL=1일 때만 생성, xlsxwriter가 있으면 xlsxwriter, 없으면 openpyxl (저장 후 다시 읽어 확인)
+"""
+
+import glob
+import importlib.util
+import os
+
+import pandas as pd
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+OUTPUT_DIR = 'outputs'
+
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+HAS_XLSXWRITER = importlib.util.find_spec('xlsxwriter') is not None
+
+EXPORT_FORMAT = os.environ.get('EXPORT_FORMAT', 'parquet' if HAS_PYARROW else 'csv')
+if EXPORT_FORMAT == 'parquet' and not HAS_PYARROW:
+    EXPORT_FORMAT = 'csv'
+
+EXPORT_EXCEL = os.environ.get('EXPORT_EXCEL', '') == '1'
+
+
+# ============================================================================
+# TABLES
+# ============================================================================
+
+def write_table(df, path, fmt=EXPORT_FORMAT):
+    """확장자 없는 경로 + 형식 → 저장한 파일 경로"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    path = f"{path}.{fmt}"
+    if fmt == 'parquet':
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+    return path
+
+
+def read_table(path):
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, encoding='utf-8-sig')
+
+
+def history_dir(name, output_dir=OUTPUT_DIR):
+    return os.path.join(output_dir, f"{name}_history")
+
+
+def append_history(df, name, date, output_dir=OUTPUT_DIR, fmt=EXPORT_FORMAT):
+    """
+    일별 이력에 하루치 추가 → 저장한 파일 경로
+    - date: 'YYYY-MM-DD' (파일 이름, 'date' 컬럼으로도 저장)
+    """
+    return write_table(df.assign(date=date), os.path.join(history_dir(name, output_dir), date), fmt)
+
+
+def read_history(name, start=None, output_dir=OUTPUT_DIR):
+    """일별 이력 전체 (start 이후만) → 날짜순 DataFrame"""
+    paths = sorted(
+        path for path in glob.glob(os.path.join(history_dir(name, output_dir), '*.*'))
+        if path.endswith(('.parquet', '.csv'))
+        and (start is None or os.path.basename(path).split('.')[0] >= start)
+    )
+    if not paths:
+        return pd.DataFrame()
+    return pd.concat([read_table(path) for path in paths], ignore_index=True)
+
+
+# ============================================================================
+# EXCEL
+# ============================================================================
+
+def check_excel(path, sheets):
+    """저장한 Excel을 다시 읽어 시트별 크기/빈 셀 위치가 DataFrame과 같은지 확인 (다르면 ValueError)"""
+    # 'NA' 같은 문자열을 빈 셀로 오인하지 않도록 빈 셀만 ''로 읽음
+    written = pd.read_excel(path, sheet_name=None, keep_default_na=False, na_values=[])
+    for sheet_name, (df, index) in sheets.items():
+        expected = df.reset_index() if index else df
+        actual = written.get(sheet_name)
+        if actual is None or actual.shape != expected.shape:
+            raise ValueError(f"Excel 시트 크기 불일치: {sheet_name} "
+                             f"({None if actual is None else actual.shape} != {expected.shape})")
+        blank = (actual.astype(object) == '').to_numpy()
+        missing = blank & (expected.notna() & (expected.astype(object) != '')).to_numpy()
+        if missing.any():
+            raise ValueError(f"Excel 시트 {sheet_name}: 빈 셀 {int(missing.sum())}개 (값 누락)")
+
+
+def write_excel(path, sheets):
+    """
+    여러 시트 Excel 저장 → 경로 (저장 후 다시 읽어 값 누락 확인)
+    - sheets: {시트 이름: (DataFrame, index 포함 여부)}
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    # pandas는 열 단위로 기록하므로 xlsxwriter의 constant_memory(행 순서 기록 전용) 모드는 사용 불가
+    engine = 'xlsxwriter' if HAS_XLSXWRITER else 'openpyxl'
+    with pd.ExcelWriter(path, engine=engine) as writer:
+        for sheet_name, (df, index) in sheets.items():
+            df.to_excel(writer, sheet_name=sheet_name, index=index)
+    check_excel(path, sheets)
+    return path
@@ -0,0 +1,123 @@
+"""
+RSS feed cache with conditional GET (ETag / Last-Modified)
+- URL별로 ETag, Last-Modified, 파싱된 항목(JSON) 저장
+- 304 응답이면 다운로드/feedparser 파싱 없이 저장된 항목 반환
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import feedparser
+import requests
+
+import http_client
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+FEED_CACHE_DB = os.environ.get('FEED_CACHE_DB', 'feed_cache.db')
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+def normalize_entry(entry):
+    """Plain, JSON-serializable subset of a feedparser entry"""
+    published = entry.get('published_parsed')
+    return {
+        'title': entry.get('title', ''),
+        'link': entry.get('link', ''),
+        'summary': entry.get('summary', ''),
+        'published_parsed': list(published[:6]) if published else None,
+        'source': {'title': entry.get('source', {}).get('title', 'Google News')},
+    }
+
+
+class FeedCache:
+    """Per-URL validators and parsed entries (thread-safe)"""
+
+    def __init__(self, path=FEED_CACHE_DB):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS feeds ("
+            " url TEXT PRIMARY KEY,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " entries TEXT NOT NULL,"
+            " fetched REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self.conn.commit()
+        self.stats = {'not_modified': 0, 'fetched': 0}
+
+    def get(self, url):
+        """(etag, last_modified, entries) or None"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, entries FROM feeds WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], row[1], json.loads(row[2])
+
+    def set(self, url, etag, last_modified, entries):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO feeds (url, etag, last_modified, entries, fetched)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, json.dumps(entries, ensure_ascii=False), time.time())
+            )
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def fetch_feed(url, cache=None):
+    """
+    Return normalized entries for a feed URL
+    - 캐시가 있으면 If-None-Match / If-Modified-Since 헤더로 요청
+    - 304: 저장된 항목 그대로 반환 (파싱 생략)
+    - 200: feedparser로 파싱 후 validator와 함께 저장
+    - 그 외: 저장된 항목이 있으면 반환, 없으면 빈 리스트
+    - 연결 오류/시간 초과: 저장된 항목이 있으면 반환, 없으면 예외 그대로 전달
+    """
+    cached = cache.get(url) if cache else None
+
+    headers = {}
+    if cached:
+        etag, last_modified, _ = cached
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+    try:
+        response = http_client.get(url, headers=headers)
+    except requests.RequestException:
+        if cached:
+            return cached[2]
+        raise
+
+    if response.status_code == 304 and cached:
+        with cache.lock:
+            cache.stats['not_modified'] += 1
+        return cached[2]
+
+    if response.status_code != 200:
+        return cached[2] if cached else []
+
+    entries = [normalize_entry(entry) for entry in feedparser.parse(response.content).entries]
+    if cache:
+        with cache.lock:
+            cache.stats['fetched'] += 1
+        cache.set(url, response.headers.get('ETag'), response.headers.get('Last-Modified'), entries)
+    return entries
@@ -0,0 +1,275 @@
+"""
+Cached fundamentals (시가총액, 상장주식수, 통화, 거래소)
+- SQLite에 필드별 조회 시각 저장, 필드마다 다른 TTL 적용
+- 빠른 경로: 상장주식수가 캐시에 있으면 시가총액 = 상장주식수 x 최근 종가 (네트워크 없음)
+- 그다음 yf.Ticker.fast_info (가벼운 시세 요청), 그래도 없는 필드만 Ticker.info
+- 만료된 종목은 스레드(데몬) 여러 개로 한꺼번에 갱신, 종목당 FUNDAMENTALS_TIMEOUT 초과하면 건너뜀
+- 시가총액은 거래 통화 기준으로 저장, 결과에는 달러 환산값(market_cap_usd)도 함께 반환
+"""
+
+import json
+import math
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+import yfinance as yf
+
+from fx_rates import ticker_currency, to_usd
+from market_data import get_info
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+FUNDAMENTALS_DB = os.environ.get('FUNDAMENTALS_DB', 'fundamentals.db')
+
+FUNDAMENTALS_WORKERS = int(os.environ.get('FUNDAMENTALS_WORKERS', '8'))
+
+# 종목 1개 조회 최대 대기 시간 (초), 초과하면 해당 종목은 캐시 값(없으면 없음)으로 진행
+FUNDAMENTALS_TIMEOUT = float(os.environ.get('FUNDAMENTALS_TIMEOUT', '30'))
+
+# 필드별 유효 기간 (일)
+FIELD_TTL_DAYS = {
+    'market_cap': 1,
+    'shares_outstanding': 30,
+    'currency': 180,
+    'exchange': 180,
+}
+
+FIELDS = list(FIELD_TTL_DAYS)
+
+# fast_info / info 키 이름
+_FAST_INFO_KEYS = {
+    'market_cap': 'marketCap',
+    'shares_outstanding': 'shares',
+    'currency': 'currency',
+    'exchange': 'exchange',
+}
+_INFO_KEYS = {
+    'market_cap': 'marketCap',
+    'shares_outstanding': 'sharesOutstanding',
+    'currency': 'currency',
+    'exchange': 'exchange',
+}
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+class FundamentalsCache:
+    """(ticker, field) → value with the time it was fetched"""
+
+    def __init__(self, path=FUNDAMENTALS_DB):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS fundamentals ("
+            " ticker TEXT NOT NULL,"
+            " field TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " fetched REAL NOT NULL,"
+            " PRIMARY KEY (ticker, field)"
+            ") WITHOUT ROWID"
+        )
+        self.conn.commit()
+
+    def read(self, tickers):
+        """{ticker: {field: (value, fetched)}}"""
+        placeholders = ','.join('?' * len(tickers))
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT ticker, field, value, fetched FROM fundamentals"
+                f" WHERE ticker IN ({placeholders})",
+                list(tickers)
+            ).fetchall()
+
+        cached = {}
+        for ticker, field, value, fetched in rows:
+            cached.setdefault(ticker, {})[field] = (json.loads(value), fetched)
+        return cached
+
+    def write(self, ticker, values, fetched=None):
+        fetched = fetched or time.time()
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO fundamentals (ticker, field, value, fetched) VALUES (?, ?, ?, ?)",
+                [(ticker, field, json.dumps(value), fetched)
+                 for field, value in values.items() if value is not None]
+            )
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def is_fresh(entry, field, now):
+    """캐시 항목 (value, fetched)이 필드 TTL 안인지"""
+    return entry is not None and now - entry[1] < FIELD_TTL_DAYS[field] * 86400
+
+
+# ============================================================================
+# FETCH
+# ============================================================================
+
+def _number(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
+
+
+def fetch_fundamentals(ticker, fields=FIELDS):
+    """
+    네트워크에서 필드 조회 → ({field: value}, 사용한 경로)
+    - fast_info로 먼저 시도, 빠진 필드만 info로 보충
+    """
+    values = {}
+    source = 'fast'
+
+    try:
+        fast = yf.Ticker(ticker).fast_info
+        for field in fields:
+            try:
+                value = fast[_FAST_INFO_KEYS[field]]
+            except Exception:
+                continue
+            values[field] = value if field in ('currency', 'exchange') else _number(value)
+    except Exception:
+        pass
+
+    missing = [field for field in fields if values.get(field) is None]
+    if missing:
+        source = 'slow'
+        info = get_info(ticker)
+        for field in missing:
+            value = info.get(_INFO_KEYS[field])
+            values[field] = value if field in ('currency', 'exchange') else _number(value)
+
+    return values, source
+
+
+def _run_with_timeout(func, items, workers, timeout):
+    """
+    func(item)를 데몬 스레드 workers개로 실행 → [(item, 결과)] (완료 순), 시간 초과 item 리스트
+    - 한 item이 timeout초를 넘기면 기다리지 않고 건너뜀, 남은 item은 새 스레드가 이어서 처리
+    - 데몬 스레드라 멈춘 요청이 있어도 프로세스 종료를 막지 않음
+    """
+    pending = queue.Queue()
+    for item in items:
+        pending.put(item)
+    done = queue.Queue()
+    running = {}
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            try:
+                item = pending.get_nowait()
+            except queue.Empty:
+                return
+            with lock:
+                running[threading.get_ident()] = (item, time.monotonic())
+            result = func(item)
+            with lock:
+                if running.pop(threading.get_ident(), None) is None:
+                    return  # 시간 초과로 이미 건너뛴 item
+            done.put((item, result))
+
+    def start():
+        threading.Thread(target=worker, daemon=True).start()
+
+    for _ in range(min(workers, len(items))):
+        start()
+
+    results, timed_out = [], []
+    while len(results) + len(timed_out) < len(items):
+        try:
+            results.append(done.get(timeout=0.5))
+        except queue.Empty:
+            pass
+        now = time.monotonic()
+        with lock:
+            expired = [ident for ident, (_, started) in running.items() if now - started > timeout]
+            timed_out.extend(running.pop(ident)[0] for ident in expired)
+        for _ in expired:
+            start()
+    return results, timed_out
+
+
+def load_fundamentals(tickers, prices=None, cache=None, workers=FUNDAMENTALS_WORKERS):
+    """
+    종목별 기본 정보 → ({ticker: {field: value}}, 통계)
+    - prices: {ticker: 최근 종가} (있으면 상장주식수로 시가총액 계산)
+    - market_cap_usd: 달러 환산 시가총액 (환율이 없으면 None)
+    - 만료/누락 필드가 있는 종목만 스레드 여러 개로 일괄 갱신 (종목당 FUNDAMENTALS_TIMEOUT)
+    """
+    tickers = list(dict.fromkeys(tickers))
+    prices = prices or {}
+    own_cache = cache is None
+    cache = cache or FundamentalsCache()
+    now = time.time()
+    stats = {'cached': 0, 'derived': 0, 'fast': 0, 'slow': 0, 'failed': 0, 'timeout': 0}
+
+    cached = cache.read(tickers)
+    results = {}
+    stale = {}
+
+    for ticker in tickers:
+        entries = cached.get(ticker, {})
+        values = {field: entry[0] for field, entry in entries.items()}
+        expired = [field for field in FIELDS if not is_fresh(entries.get(field), field, now)]
+
+        # 빠른 경로: 상장주식수 x 최근 종가
+        price = _number(prices.get(ticker))
+        if 'market_cap' in expired and price and 'shares_outstanding' not in expired:
+            values['market_cap'] = values['shares_outstanding'] * price
+            expired.remove('market_cap')
+            cache.write(ticker, {'market_cap': values['market_cap']}, now)
+            stats['derived'] += 1
+
+        results[ticker] = values
+        if expired:
+            stale[ticker] = expired
+        else:
+            stats['cached'] += 1
+
+    if stale:
+        def refresh(ticker):
+            try:
+                return fetch_fundamentals(ticker, stale[ticker])
+            except Exception:
+                return {}, 'failed'
+
+        refreshed, timed_out = _run_with_timeout(refresh, list(stale), workers, FUNDAMENTALS_TIMEOUT)
+        stats['timeout'] = len(timed_out)
+        for ticker, (values, source) in refreshed:
+            fresh = {field: value for field, value in values.items() if value is not None}
+            if not fresh:
+                stats['failed'] += 1
+                continue
+            cache.write(ticker, fresh)
+            results[ticker].update(fresh)
+            stats[source] += 1
+
+    # 달러 환산 (통화별 환율 한 번 조회 후 일괄 계산)
+    currencies = {ticker: ticker_currency(ticker, values.get('currency')) for ticker, values in results.items()}
+    market_caps = to_usd({ticker: values.get('market_cap') for ticker, values in results.items()}, currencies)
+    for ticker, value in market_caps.items():
+        results[ticker]['market_cap_usd'] = None if math.isnan(value) else value
+
+    if own_cache:
+        cache.close()
+    return results, stats
+
+
+def get_market_cap(ticker, price=None):
+    """한 종목 달러 환산 시가총액 (없으면 0)"""
+    results, _ = load_fundamentals([ticker], prices={ticker: price} if price else None)
+    return results[ticker].get('market_cap_usd') or 0
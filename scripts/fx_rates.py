@@ -0,0 +1,209 @@
+"""
+FX rates (달러 환산)
+- 시가총액/가격은 종목 거래 통화 기준 → 점수/스크리닝의 달러 구간과 비교하려면 환산 필요
+- 실행마다 필요한 통화를 한 번에 일괄 조회 ({통화}USD=X), 실패한 통화만 역방향({통화}=X)으로 재시도
+- SQLite에 조회 시각과 함께 저장, FX_TTL_HOURS 안에는 네트워크 없이 재사용
+- 조회 실패 시 만료된 캐시 값이라도 사용 (환율이 없으면 NaN)
+- cached_only: 네트워크 없이 이 실행의 값/유효 기간 안 캐시만 사용 (스크리닝 1단계처럼 조회를 미룰 때)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from market_data import download_history
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# 기본 정보 캐시와 같은 파일 (워크플로 캐시를 함께 사용)
+FX_DB = os.environ.get('FX_DB', 'fundamentals.db')
+
+FX_TTL_HOURS = float(os.environ.get('FX_TTL_HOURS', '12'))
+
+# 보조 단위 통화 → (기준 통화, 배수)
+SUBUNITS = {
+    'GBp': ('GBP', 0.01),
+    'GBX': ('GBP', 0.01),
+    'ILA': ('ILS', 0.01),
+    'ZAc': ('ZAR', 0.01),
+}
+
+# 통화 정보가 없을 때 티커 접미사로 추정
+SUFFIX_CURRENCIES = {
+    '.KS': 'KRW', '.KQ': 'KRW',
+    '.HK': 'HKD',
+    '.T': 'JPY',
+    '.TW': 'TWD', '.TWO': 'TWD',
+    '.SS': 'CNY', '.SZ': 'CNY',
+    '.L': 'GBp',
+    '.PA': 'EUR', '.DE': 'EUR', '.F': 'EUR', '.AS': 'EUR', '.MI': 'EUR', '.MC': 'EUR', '.BR': 'EUR',
+    '.SW': 'CHF',
+    '.TO': 'CAD', '.V': 'CAD',
+    '.AX': 'AUD',
+    '.SI': 'SGD',
+    '.NS': 'INR', '.BO': 'INR',
+}
+
+# 이 실행에서 이미 확인한 환율
+_rates = {'USD': 1.0}
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+class FXCache:
+    """SQLite-backed USD rate per currency with fetch timestamps"""
+
+    def __init__(self, path=FX_DB):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS fx_rates ("
+            " currency TEXT PRIMARY KEY,"
+            " rate REAL NOT NULL,"
+            " fetched REAL NOT NULL"
+            ")"
+        )
+        self.conn.commit()
+
+    def read(self, currencies):
+        """{currency: (1단위당 달러, fetched)}"""
+        placeholders = ','.join('?' * len(currencies))
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT currency, rate, fetched FROM fx_rates WHERE currency IN ({placeholders})",
+                list(currencies)
+            ).fetchall()
+        return {currency: (rate, fetched) for currency, rate, fetched in rows}
+
+    def write(self, rates, fetched=None):
+        fetched = fetched or time.time()
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO fx_rates (currency, rate, fetched) VALUES (?, ?, ?)",
+                [(currency, rate, fetched) for currency, rate in rates.items()]
+            )
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+# ============================================================================
+# RATES
+# ============================================================================
+
+def ticker_currency(ticker, currency=None):
+    """거래 통화 (기본 정보 값 우선, 없으면 티커 접미사, 그래도 없으면 USD)"""
+    if currency:
+        return currency
+    suffix = ticker[ticker.rfind('.'):] if '.' in ticker else ''
+    return SUFFIX_CURRENCIES.get(suffix, 'USD')
+
+
+def _last_closes(symbols):
+    """{symbol: 최근 종가} (일괄 요청)"""
+    if not symbols:
+        return {}
+    panel, _ = download_history(symbols, period='5d')
+    if panel.empty:
+        return {}
+    last = panel['Close'].ffill().iloc[-1]
+    return {symbol: float(last[symbol]) for symbol in symbols
+            if symbol in last.index and np.isfinite(last[symbol]) and last[symbol] > 0}
+
+
+def fetch_rates(currencies):
+    """네트워크에서 환율 조회 → {currency: 1단위당 달러}"""
+    direct = _last_closes([f"{currency}USD=X" for currency in currencies])
+    rates = {currency: direct[f"{currency}USD=X"] for currency in currencies if f"{currency}USD=X" in direct}
+
+    missing = [currency for currency in currencies if currency not in rates]
+    inverse = _last_closes([f"{currency}=X" for currency in missing])
+    rates.update({currency: 1 / inverse[f"{currency}=X"] for currency in missing if f"{currency}=X" in inverse})
+    return rates
+
+
+def load_rates(currencies, cache=None, cached_only=False):
+    """
+    통화별 달러 환율 → ({currency: 1단위당 달러}, 통계)
+    - 보조 단위 통화(GBp 등)는 배수까지 반영한 값
+    - 이 실행에서 이미 확인한 통화 → 캐시(TTL 안) → 네트워크 순
+    - cached_only면 네트워크 조회 없이 만료/누락 통화는 빠짐 (skipped, 다음 호출에서 조회)
+    """
+    bases = {SUBUNITS.get(c, (c, 1.0))[0] for c in currencies if c}
+    stats = {'memo': 0, 'cached': 0, 'fetched': 0, 'stale': 0, 'failed': 0, 'skipped': 0}
+
+    needed = [c for c in bases if c not in _rates]
+    stats['memo'] = len(bases) - len(needed)
+    if needed:
+        own_cache = cache is None
+        cache = cache or FXCache()
+        now = time.time()
+        cached = cache.read(needed)
+        stale = []
+        for currency in needed:
+            entry = cached.get(currency)
+            if entry and now - entry[1] < FX_TTL_HOURS * 3600:
+                _rates[currency] = entry[0]
+                stats['cached'] += 1
+            else:
+                stale.append(currency)
+
+        if stale and cached_only:
+            stats['skipped'] = len(stale)
+        elif stale:
+            fetched = fetch_rates(stale)
+            cache.write(fetched, now)
+            for currency in stale:
+                if currency in fetched:
+                    _rates[currency] = fetched[currency]
+                    stats['fetched'] += 1
+                elif currency in cached:
+                    _rates[currency] = cached[currency][0]
+                    stats['stale'] += 1
+                else:
+                    stats['failed'] += 1
+
+        if own_cache:
+            cache.close()
+
+    rates = {}
+    for currency in currencies:
+        base, factor = SUBUNITS.get(currency, (currency, 1.0))
+        if base in _rates:
+            rates[currency] = _rates[base] * factor
+    return rates, stats
+
+
+# ============================================================================
+# CONVERSION
+# ============================================================================
+
+def usd_factors(currencies, cached_only=False):
+    """{ticker: 통화} → {ticker: 1단위당 달러} (환율 없는 종목은 NaN)"""
+    rates, _ = load_rates(set(currencies.values()), cached_only=cached_only)
+    return {ticker: rates.get(currency, np.nan) for ticker, currency in currencies.items()}
+
+
+def to_usd(values, currencies, cached_only=False):
+    """
+    금액 달러 환산 (벡터)
+    - values: 숫자 Series/dict ({ticker: 금액}) 또는 (... x 종목) DataFrame
+    - currencies: {ticker: 통화}
+    - cached_only: load_rates 참고 (유효한 환율이 없는 종목은 NaN)
+    """
+    factors = pd.Series(usd_factors(currencies, cached_only), dtype=float)
+    if isinstance(values, pd.DataFrame):
+        return values * factors.reindex(values.columns)
+    values = pd.Series(values, dtype=float)
+    return values * factors.reindex(values.index)
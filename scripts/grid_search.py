@@ -0,0 +1,188 @@
+"""
+Scoring weight/threshold grid search
+- 구성 요소별 가중치(배점 배수)와 구간 하한 배수 조합을 한꺼번에 평가
+- 구성 요소 점수는 배수 값마다 한 번만 계산해 두고, 설정 x 월말 x 종목 배열로 합산 (청크 단위)
+- 백테스트(backtest.py)와 같은 선정/평가 로직으로 순위 산출
+- 결과: outputs/grid_search_YYYYMM.csv (월별로 비교하기 쉬운 고정 컬럼 표)
+
+사용법:
+  python scripts/grid_search.py
+  python scripts/grid_search.py --grid weight_return_3m=0,1,2 --grid scale_return_6m=0.5:1.5:5
+"""
+
+import argparse
+import itertools
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from backtest import (
+    load_backtest_data, nanmean, pick_per_sector, portfolio_returns, sector_columns, sector_metrics,
+)
+from ohlcv_cache import PERIOD_DAYS
+from scoring import COMPONENTS, TIERED_COMPONENTS, component_points
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# 기본 탐색 범위 (1.0 = 현재 배점표)
+DEFAULT_GRID = {
+    **{f"weight_{component}": [0.0, 0.5, 1.0, 1.5] for component in COMPONENTS},
+    'scale_return_3m': [0.75, 1.0, 1.25],
+    'scale_return_6m': [0.75, 1.0, 1.25],
+}
+
+# 한 번에 평가할 설정 수 (메모리: 청크 x 월말 x 종목 x 8바이트)
+CHUNK_SIZE = int(os.environ.get('GRID_CHUNK_SIZE', '256'))
+
+# 결과 표에 남길 상위 설정 수
+TOP_N = 50
+
+RANK_METRICS = ['avg_return', 'excess', 'hit_rate', 'cumulative']
+
+
+# ============================================================================
+# GRID
+# ============================================================================
+
+def parse_values(text):
+    """'0,0.5,1' 또는 'start:stop:count' → 값 리스트"""
+    if ':' in text:
+        start, stop, count = text.split(':')
+        return [round(v, 6) for v in np.linspace(float(start), float(stop), int(count))]
+    return [float(v) for v in text.split(',')]
+
+
+def build_grid(overrides=None):
+    """파라미터 이름 → 값 리스트의 곱집합 → (이름 리스트, (설정 수 x 파라미터) 배열)"""
+    grid = dict(DEFAULT_GRID)
+    for name, values in (overrides or {}).items():
+        if not (name.startswith('weight_') and name[7:] in COMPONENTS) and \
+                not (name.startswith('scale_') and name[6:] in TIERED_COMPONENTS):
+            raise ValueError(f"알 수 없는 파라미터: {name}")
+        grid[name] = values
+
+    names = list(grid)
+    configs = np.array(list(itertools.product(*grid.values())), dtype=float)
+    # 가중치가 전부 0이면 점수가 모두 같아 의미 없음
+    weights = configs[:, [names.index(f"weight_{c}") for c in COMPONENTS]]
+    return names, configs[weights.sum(axis=1) > 0]
+
+
+def component_tables(features, names, configs):
+    """
+    구성 요소별 점수 표 → {component: (배수 인덱스 (설정 수,), 점수 (배수 수 x 월말 x 종목))}
+    - 같은 배수 값은 한 번만 계산
+    """
+    tables = {}
+    for component in COMPONENTS:
+        key = f"scale_{component}"
+        scales = configs[:, names.index(key)] if key in names else np.ones(len(configs))
+        unique, index = np.unique(scales, return_inverse=True)
+        points = np.stack([component_points(component, features, scale) for scale in unique])
+        tables[component] = (index, points)
+    return tables
+
+
+def evaluate_grid(data, names, configs, chunk_size=CHUNK_SIZE):
+    """전 설정 백테스트 → 설정별 성과 DataFrame"""
+    tables = component_tables(data['features'], names, configs)
+    columns = sector_columns(data['tickers'])
+    weights = {c: configs[:, names.index(f"weight_{c}")] for c in COMPONENTS}
+    universe = nanmean(np.where(data['eligible'], data['forward'], np.nan))
+
+    results = []
+    for start in range(0, len(configs), chunk_size):
+        chunk = slice(start, start + chunk_size)
+
+        # (청크 x 월말 x 종목) 점수 = sum(가중치 x 구성 요소 점수)
+        scores = sum(
+            weights[c][chunk, None, None] * points[index[chunk]]
+            for c, (index, points) in tables.items()
+        )
+        picks = pick_per_sector(scores, data['eligible'], columns)
+        metrics = sector_metrics(picks, data['forward'], data['eligible'], columns)
+        monthly = portfolio_returns(metrics)
+        months = np.isfinite(monthly)
+
+        results.append(pd.DataFrame({
+            'avg_return': nanmean(monthly),
+            'excess': nanmean(np.stack([m['excess'] for m in metrics.values()], axis=-1)),
+            'hit_rate': ((monthly > universe) & months).sum(axis=-1) / np.maximum(months.sum(axis=-1), 1) * 100,
+            'cumulative': (np.nanprod(1 + monthly / 100, axis=-1) - 1) * 100,
+            'turnover': nanmean(np.stack([m['turnover'] for m in metrics.values()], axis=-1)),
+        }))
+
+    table = pd.concat(results, ignore_index=True)
+    return pd.concat([pd.DataFrame(configs, columns=names), table], axis=1)
+
+
+def rank_configs(table, rank_by='avg_return', top_n=TOP_N):
+    """성과 순위 (동점이면 기본 설정에 가까운 순) → 상위 top_n"""
+    params = [c for c in table.columns if c.startswith(('weight_', 'scale_'))]
+    table = table.assign(distance=(table[params] - 1.0).abs().sum(axis=1))
+    ranked = table.sort_values([rank_by, 'distance'], ascending=[False, True], kind='stable')
+    ranked = ranked.drop(columns='distance').head(top_n).reset_index(drop=True)
+    ranked.insert(0, 'rank', range(1, len(ranked) + 1))
+    return ranked
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='선정 점수 가중치/구간 그리드 탐색')
+    parser.add_argument('--period', default='5y', choices=list(PERIOD_DAYS))
+    parser.add_argument('--horizon', type=int, default=1, help='보유 기간 (개월)')
+    parser.add_argument('--grid', action='append', default=[], metavar='NAME=VALUES',
+                        help="예: weight_market_cap=0,1,2 / scale_return_3m=0.5:1.5:5")
+    parser.add_argument('--rank-by', default='avg_return', choices=RANK_METRICS)
+    parser.add_argument('--top', type=int, default=TOP_N)
+    parser.add_argument('--offline', action='store_true', help='캐시된 일봉만 사용')
+    args = parser.parse_args()
+
+    overrides = {}
+    for item in args.grid:
+        name, _, values = item.partition('=')
+        overrides[name.strip()] = parse_values(values)
+
+    print("="*80)
+    print("🧮 선정 점수 그리드 탐색")
+    print("="*80 + "\n")
+
+    names, configs = build_grid(overrides)
+    start = time.perf_counter()
+    data = load_backtest_data(args.period, args.horizon, offline=args.offline)
+    loaded = time.perf_counter()
+    table = evaluate_grid(data, names, configs)
+    done = time.perf_counter()
+
+    print(f"📋 설정 {len(configs):,}개 x 월말 {len(data['dates'])}개 x 종목 {len(data['tickers'])}개")
+    print(f"⏱️ 데이터 준비 {loaded - start:.2f}초, 탐색 {done - loaded:.2f}초 "
+          f"({len(configs) / max(done - loaded, 1e-9):,.0f}개/초)\n")
+
+    ranked = rank_configs(table, args.rank_by, args.top)
+    baseline = table[(table[[n for n in names if n.startswith(('weight_', 'scale_'))]] == 1.0).all(axis=1)]
+
+    pd.set_option('display.width', 250)
+    print(ranked.head(10).to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+    if not baseline.empty:
+        row = baseline.iloc[0]
+        print(f"\n📌 현재 배점표: 월평균 {row['avg_return']:+.2f}%, 초과 {row['excess']:+.2f}%p, "
+              f"적중률 {row['hit_rate']:.1f}%, 누적 {row['cumulative']:+.2f}%")
+
+    output_dir = 'outputs'
+    os.makedirs(output_dir, exist_ok=True)
+    output_file = f"{output_dir}/grid_search_{datetime.now().strftime('%Y%m')}.csv"
+    ranked.round(4).to_csv(output_file, index=False, encoding='utf-8-sig')
+    print(f"\n📁 결과 파일 저장: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
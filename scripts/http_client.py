@@ -0,0 +1,84 @@
+"""
+Shared HTTP client
+- 호스트별 keep-alive 커넥션 풀을 재사용하는 requests.Session
+- 재시도(지수 백오프) + 기본 타임아웃
+- rate_limit.HOST_RATE_LIMITS에 등록된 호스트는 요청 전 토큰 획득
+"""
+
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import rate_limit
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+HTTP_TIMEOUT = float(os.environ.get('HTTP_TIMEOUT', '10'))
+HTTP_RETRIES = int(os.environ.get('HTTP_RETRIES', '3'))
+HTTP_BACKOFF = float(os.environ.get('HTTP_BACKOFF', '0.5'))
+
+# 호스트당 유지할 커넥션 수 (동시 수집 스레드 수 이상으로)
+POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', '16'))
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+# ============================================================================
+# SESSION
+# ============================================================================
+
+def create_session(retries=HTTP_RETRIES, backoff_factor=HTTP_BACKOFF, pool_maxsize=POOL_MAXSIZE):
+    """Create a pooled session with retry/backoff mounted for http and https"""
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS,
+        # 파파고/텔레그램 POST도 재시도 대상
+        allowed_methods=frozenset(['GET', 'POST']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the process-wide shared session"""
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def request(method, url, timeout=HTTP_TIMEOUT, session=None, **kwargs):
+    """Rate-limited request through the shared session (timeout always set)"""
+    rate_limit.acquire(url)
+    return (session or get_session()).request(method, url, timeout=timeout, **kwargs)
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
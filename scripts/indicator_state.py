@@ -0,0 +1,286 @@
+"""
+Incremental indicator state (종목별 O(1) 갱신)
+- 종목별 상태: 최근 종가/거래량 버퍼, MA20/MA60/거래량 20·60 이동합, Wilder RSI 평균 상승/하락폭
+- 새 봉 1개당 덧셈/뺄셈 몇 번으로 갱신 → 1년치 재계산 불필요
+- 상태는 ohlcv_cache.db의 indicator_state 테이블에 저장
+- 상태가 없거나 캐시가 재다운로드(수정주가 반영)되면 저장된 일봉으로 다시 생성
+- 마지막 봉이 바뀐 경우(장중 잠정 봉 → 확정 봉)는 직전 상태로 되돌린 뒤 다시 반영
+"""
+
+import json
+import math
+from collections import deque
+
+import pandas as pd
+
+from indicators import INDICATOR_COLUMNS, LOOKBACK_BARS, RSI_PERIOD
+from ohlcv_cache import OHLCVCache
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# 버퍼 길이: 6개월 수익률(126봉 전 종가) + 되돌리기용 1봉
+BUFFER_BARS = LOOKBACK_BARS + 1
+
+# 마지막 봉 종가가 이 이상 달라졌으면 봉 수정으로 보고 되돌린 뒤 반영
+REVISION_TOLERANCE = 1e-9
+
+_WINDOWS = (20, 60)
+
+
+# ============================================================================
+# STATE
+# ============================================================================
+
+class IndicatorState:
+    """Rolling sums and Wilder averages for one ticker, updated one bar at a time"""
+
+    def __init__(self):
+        self.bars = 0
+        self.last_date = None
+        self.prev_date = None
+        self.closes = deque(maxlen=BUFFER_BARS)
+        self.volumes = deque(maxlen=BUFFER_BARS)
+        self.close_sums = {window: 0.0 for window in _WINDOWS}
+        self.volume_sums = {window: 0.0 for window in _WINDOWS}
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        # 되돌리기용 직전 평균
+        self.prev_avg = None
+
+    # ------------------------------------------------------------------
+    # updates
+    # ------------------------------------------------------------------
+
+    def push(self, date, close, volume):
+        """새 봉 1개 반영"""
+        volume = 0.0 if volume is None or math.isnan(volume) else float(volume)
+        close = float(close)
+
+        for window in _WINDOWS:
+            if len(self.closes) >= window:
+                self.close_sums[window] -= self.closes[-window]
+                self.volume_sums[window] -= self.volumes[-window]
+            self.close_sums[window] += close
+            self.volume_sums[window] += volume
+
+        self.prev_avg = (self.avg_gain, self.avg_loss)
+        if self.closes:
+            delta = close - self.closes[-1]
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            if self.bars == 1:
+                self.avg_gain, self.avg_loss = gain, loss
+            else:
+                self.avg_gain += (gain - self.avg_gain) / RSI_PERIOD
+                self.avg_loss += (loss - self.avg_loss) / RSI_PERIOD
+
+        self.closes.append(close)
+        self.volumes.append(volume)
+        self.bars += 1
+        self.prev_date, self.last_date = self.last_date, date
+
+    def rollback(self):
+        """마지막 봉 반영 취소 (1단계만 가능), 불가능하면 False"""
+        if self.prev_avg is None or not self.closes:
+            return False
+
+        close = self.closes.pop()
+        volume = self.volumes.pop()
+        for window in _WINDOWS:
+            self.close_sums[window] -= close
+            self.volume_sums[window] -= volume
+            if len(self.closes) >= window:
+                self.close_sums[window] += self.closes[-window]
+                self.volume_sums[window] += self.volumes[-window]
+
+        self.avg_gain, self.avg_loss = self.prev_avg
+        self.prev_avg = None
+        self.bars -= 1
+        self.last_date, self.prev_date = self.prev_date, None
+        return True
+
+    def apply(self, date, close, volume):
+        """
+        봉 1개 반영 (이미 반영된 날짜면 무시, 마지막 봉 수정이면 되돌린 뒤 반영)
+        반환: False면 상태를 쓸 수 없음(다시 생성 필요)
+        """
+        if self.last_date is not None and date < self.last_date:
+            return True
+        if date == self.last_date:
+            if abs(close - self.closes[-1]) <= REVISION_TOLERANCE * abs(self.closes[-1]):
+                return True
+            if not self.rollback():
+                return False
+        self.push(date, close, volume)
+        return True
+
+    # ------------------------------------------------------------------
+    # values
+    # ------------------------------------------------------------------
+
+    def _return_since(self, lag):
+        if self.bars < lag or len(self.closes) < lag:
+            return 0.0
+        return (self.closes[-1] / self.closes[-lag] - 1) * 100
+
+    def row(self):
+        """indicators.compute_indicators와 같은 컬럼의 dict (봉 2개 미만이면 None)"""
+        if self.bars < 2:
+            return None
+
+        n = self.bars
+        price = self.closes[-1]
+        ma_20 = self.close_sums[20] / 20 if n >= 20 else price
+        ma_60 = self.close_sums[60] / 60 if n >= 60 else price
+
+        volume_now = self.volumes[-1]
+        volume_20 = self.volume_sums[20] / 20 if n >= 20 else volume_now
+        volume_60 = self.volume_sums[60] / min(n, 60)
+
+        if n < RSI_PERIOD:
+            rsi = 50.0
+        elif self.avg_loss > 0:
+            rsi = 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+        else:
+            rsi = 100.0 if self.avg_gain > 0 else float('nan')
+
+        return {
+            'bars': n,
+            'price': price,
+            'change_1d': (price / self.closes[-2] - 1) * 100,
+            'change_1w': self._return_since(5),
+            'change_1m': self._return_since(21),
+            'return_3m': self._return_since(63),
+            'return_6m': self._return_since(126),
+            'ma_20': ma_20,
+            'ma_60': ma_60,
+            'vs_ma20': (price / ma_20 - 1) * 100 if ma_20 != 0 else 0.0,
+            'golden_cross': ma_20 > ma_60,
+            'dead_cross': ma_20 < ma_60,
+            'volume_ratio': volume_now / volume_20 * 100 if volume_20 > 0 else 100.0,
+            'volume_trend': volume_20 / volume_60 if volume_60 > 0 else 1.0,
+            'rsi': rsi,
+        }
+
+    def provisional_row(self, close, volume, date=None):
+        """
+        저장하지 않고 잠정 봉(장중 현재가)을 반영한 지표 계산
+        - 같은 날짜 봉이 이미 있으면 교체한 값으로 계산
+        """
+        trial = self.copy()
+        if not trial.apply(date or trial.last_date or '', close, volume):
+            return None
+        return trial.row()
+
+    # ------------------------------------------------------------------
+    # persistence
+    # ------------------------------------------------------------------
+
+    def copy(self):
+        return IndicatorState.from_json(self.to_json())
+
+    def to_json(self):
+        return json.dumps({
+            'bars': self.bars,
+            'last_date': self.last_date,
+            'prev_date': self.prev_date,
+            'closes': list(self.closes),
+            'volumes': list(self.volumes),
+            'close_sums': [self.close_sums[window] for window in _WINDOWS],
+            'volume_sums': [self.volume_sums[window] for window in _WINDOWS],
+            'avg': [self.avg_gain, self.avg_loss],
+            'prev_avg': self.prev_avg,
+        })
+
+    @classmethod
+    def from_json(cls, text):
+        data = json.loads(text)
+        state = cls()
+        state.bars = data['bars']
+        state.last_date = data['last_date']
+        state.prev_date = data['prev_date']
+        state.closes.extend(data['closes'])
+        state.volumes.extend(data['volumes'])
+        state.close_sums = dict(zip(_WINDOWS, data['close_sums']))
+        state.volume_sums = dict(zip(_WINDOWS, data['volume_sums']))
+        state.avg_gain, state.avg_loss = data['avg']
+        state.prev_avg = tuple(data['prev_avg']) if data['prev_avg'] else None
+        return state
+
+
+def build_state(rows):
+    """[(date, close, volume)] (날짜순) 전체로 상태 생성"""
+    state = IndicatorState()
+    for date, close, volume in rows:
+        state.push(date, close, volume)
+    return state
+
+
+# ============================================================================
+# SYNC WITH OHLCV CACHE
+# ============================================================================
+
+def _group_rows(rows):
+    """(ticker, date, close, volume) rows → {ticker: [(date, close, volume)]}"""
+    grouped = {}
+    for ticker, date, close, volume in rows:
+        grouped.setdefault(ticker, []).append((date, close, volume))
+    return grouped
+
+
+def sync_states(tickers, cache):
+    """
+    캐시의 새 봉만 반영해 종목별 상태 갱신 후 저장 → ({ticker: IndicatorState}, 통계)
+    - 상태가 없거나, 저장 시점의 마지막 봉이 캐시에 없거나, 되돌릴 수 없는 수정이면 재생성
+    """
+    tickers = list(dict.fromkeys(tickers))
+    stats = {'updated': 0, 'rebuilt': 0, 'new_bars': 0}
+
+    states = {ticker: IndicatorState.from_json(text)
+              for ticker, text in cache.indicator_states(tickers).items()}
+    new_rows = _group_rows(cache.closes_volumes_since_state(list(states))) if states else {}
+
+    rebuild = [ticker for ticker in tickers if ticker not in states]
+    for ticker, state in states.items():
+        rows = new_rows.get(ticker, [])
+        if not rows or rows[0][0] != state.last_date:
+            rebuild.append(ticker)
+            continue
+        if not all(state.apply(*row) for row in rows):
+            rebuild.append(ticker)
+            continue
+        stats['updated'] += 1
+        stats['new_bars'] += len(rows) - 1
+
+    if rebuild:
+        for ticker, rows in _group_rows(cache.closes_volumes(rebuild)).items():
+            states[ticker] = build_state(rows)
+            stats['rebuilt'] += 1
+
+    states = {ticker: states[ticker] for ticker in tickers
+              if ticker in states and states[ticker].bars > 0}
+    cache.save_indicator_states(
+        [(ticker, state.last_date, state.to_json()) for ticker, state in states.items()]
+    )
+    return states, stats
+
+
+def states_frame(states):
+    """{ticker: IndicatorState} → indicators.compute_indicators와 같은 DataFrame"""
+    rows = {ticker: state.row() for ticker, state in states.items()}
+    rows = {ticker: row for ticker, row in rows.items() if row is not None}
+    frame = pd.DataFrame.from_dict(rows, orient='index', columns=INDICATOR_COLUMNS)
+    frame.index.name = 'ticker'
+    return frame
+
+
+def load_indicators(tickers, cache=None):
+    """저장된 상태를 새 봉만큼 갱신해 전 종목 지표 반환 → (DataFrame, 통계)"""
+    own_cache = cache is None
+    cache = cache or OHLCVCache()
+    states, stats = sync_states(tickers, cache)
+    if own_cache:
+        cache.close()
+    return states_frame(states), stats
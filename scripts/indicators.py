@@ -0,0 +1,155 @@
+"""
+Vectorized indicator engine
+- (날짜 x 종목) 종가/거래량 패널에서 전 종목 지표를 한 번에 계산
+- 거래소마다 거래일이 달라 생기는 빈칸은 종목별로 "최근 N개 봉" 기준으로 정렬 후 계산
+- 일일 리포트와 종목 선정이 같은 계산식 사용
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+RSI_PERIOD = 14
+
+# 계산에 필요한 최대 봉 수 (6개월 수익률 126봉 + 1)
+LOOKBACK_BARS = 127
+
+INDICATOR_COLUMNS = [
+    'bars', 'price', 'change_1d', 'change_1w', 'change_1m',
+    'return_3m', 'return_6m', 'ma_20', 'ma_60', 'vs_ma20',
+    'golden_cross', 'dead_cross', 'volume_ratio', 'volume_trend', 'rsi',
+]
+
+
+# ============================================================================
+# ALIGNMENT
+# ============================================================================
+
+def align_recent(close, volume, bars=LOOKBACK_BARS):
+    """
+    종목별 유효 봉을 아래(최근)쪽으로 모은 (bars x 종목) 배열 반환
+    - 마지막 행 = 각 종목의 최신 봉, 위쪽 빈칸은 NaN
+    - 반환: (close 배열, volume 배열, 종목별 봉 수)
+    """
+    c = close.to_numpy(dtype=float)
+    v = volume.reindex(index=close.index, columns=close.columns).to_numpy(dtype=float)
+    valid = ~np.isnan(c)
+    # 종가 없는 봉의 거래량은 빈칸 (정렬 후 위쪽으로 밀려 평균에 섞이지 않도록)
+    v = np.where(valid, v, np.nan)
+
+    # False(빈칸)가 앞, True(유효)가 뒤로 가는 안정 정렬 → 유효 봉 순서 유지
+    order = np.argsort(valid, axis=0, kind='stable')
+    c = np.take_along_axis(c, order, axis=0)
+    v = np.take_along_axis(v, order, axis=0)
+    counts = valid.sum(axis=0)
+
+    if len(c) < bars:
+        pad = np.full((bars - len(c), c.shape[1]), np.nan)
+        c = np.vstack([pad, c])
+        v = np.vstack([pad, v])
+    return c[-bars:], v[-bars:], counts
+
+
+# ============================================================================
+# INDICATORS
+# ============================================================================
+
+def _return_since(c, counts, lag):
+    """(최신 / lag봉 전 - 1) * 100, 봉이 모자라면 0"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = (c[-1] / c[-lag] - 1) * 100
+    return np.where(counts >= lag, change, 0.0)
+
+
+def _moving_average(c, counts, window):
+    """최근 window봉 평균, 봉이 모자라면 현재가"""
+    return np.where(counts >= window, c[-window:].mean(axis=0), c[-1])
+
+
+def rsi_last(c, counts, period=RSI_PERIOD):
+    """
+    Wilder RSI의 최신값 (봉이 period 미만이면 50)
+    - 평균 상승/하락폭: alpha=1/period 지수평활, 첫 변화량으로 시작
+    - indicator_state의 증분 갱신과 같은 식
+    """
+    deltas = np.diff(c, axis=0)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    # 봉이 없는 구간은 NaN으로 남겨 평활 시작점을 종목별 첫 변화량으로 맞춤
+    gains[np.isnan(deltas)] = np.nan
+    losses[np.isnan(deltas)] = np.nan
+
+    smooth = dict(alpha=1 / period, adjust=False)
+    avg_gain = pd.DataFrame(gains).ewm(**smooth).mean().to_numpy()[-1]
+    avg_loss = pd.DataFrame(losses).ewm(**smooth).mean().to_numpy()[-1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+    return np.where(counts < period, 50.0, rsi)
+
+
+def compute_indicators(close, volume):
+    """
+    전 종목 지표 계산 → 종목(ticker) index, INDICATOR_COLUMNS 컬럼의 DataFrame
+    - close, volume: (날짜 x 종목) DataFrame
+    - 봉이 2개 미만인 종목은 제외
+    """
+    c, v, counts = align_recent(close, volume)
+
+    price = c[-1]
+    ma_20 = _moving_average(c, counts, 20)
+    ma_60 = _moving_average(c, counts, 60)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change_1d = (price / c[-2] - 1) * 100
+        vs_ma20 = np.where(ma_20 != 0, (price / ma_20 - 1) * 100, 0.0)
+
+        volume_now = v[-1]
+        volume_20 = np.where(counts >= 20, v[-20:].mean(axis=0), volume_now)
+        with warnings.catch_warnings():
+            # 봉이 없는 종목(전부 NaN)은 아래에서 제외됨
+            warnings.simplefilter('ignore', RuntimeWarning)
+            volume_60 = np.nanmean(v[-60:], axis=0)
+        volume_ratio = np.where(volume_20 > 0, volume_now / volume_20 * 100, 100.0)
+        volume_trend = np.where(volume_60 > 0, volume_20 / volume_60, 1.0)
+
+    result = pd.DataFrame({
+        'bars': counts,
+        'price': price,
+        'change_1d': change_1d,
+        'change_1w': _return_since(c, counts, 5),
+        'change_1m': _return_since(c, counts, 21),
+        'return_3m': _return_since(c, counts, 63),
+        'return_6m': _return_since(c, counts, 126),
+        'ma_20': ma_20,
+        'ma_60': ma_60,
+        'vs_ma20': vs_ma20,
+        'golden_cross': ma_20 > ma_60,
+        'dead_cross': ma_20 < ma_60,
+        'volume_ratio': volume_ratio,
+        'volume_trend': volume_trend,
+        'rsi': rsi_last(c, counts),
+    }, index=close.columns)
+    result.index.name = 'ticker'
+
+    return result[result['bars'] >= 2]
+
+
+def compute_from_panel(panel):
+    """market_data/ohlcv_cache 패널((field, ticker) 컬럼)에서 바로 계산"""
+    if panel.empty:
+        return pd.DataFrame(columns=INDICATOR_COLUMNS)
+    return compute_indicators(panel['Close'], panel['Volume'])
+
+
+def compute_from_history(hist):
+    """단일 종목 OHLCV(hist)의 지표 1행(Series), 데이터 부족 시 None"""
+    frame = compute_indicators(hist[['Close']].rename(columns={'Close': 0}),
+                               hist[['Volume']].rename(columns={'Volume': 0}))
+    return frame.iloc[0] if not frame.empty else None
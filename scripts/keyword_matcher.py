@@ -0,0 +1,93 @@
+"""
+Compiled keyword matcher for news relevance scoring
+- 키워드 전체를 정규식 하나(긴 키워드 우선 alternation)로 컴파일
+- 영문: 영숫자 경계 + 복수형/활용형(s, es, ed, ing) 허용
+- 한글: 조사가 바로 붙으므로 부분 일치
+- 제목+설명을 한 번에 훑고, 여러 기사를 한 번의 스캔으로 채점 가능
+"""
+
+import re
+from bisect import bisect_right
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# 등급별 가중치 (매칭된 키워드마다 합산, 같은 키워드는 기사당 1회)
+KEYWORD_WEIGHTS = {
+    'high': 10,
+    'medium': 6,
+}
+
+# 매칭이 하나도 없을 때 점수
+BASE_SCORE = 1
+
+# 배치 스캔 시 기사 사이 구분자 (키워드에 나올 수 없는 문자)
+_BATCH_SEPARATOR = '\x00'
+
+
+# ============================================================================
+# MATCHER
+# ============================================================================
+
+def _keyword_pattern(keyword):
+    escaped = re.escape(keyword).replace(r'\ ', r'\s+')
+    if keyword.isascii():
+        return rf'(?<![a-z0-9])({escaped})(?:s|es|ed|ing)?(?![a-z0-9])'
+    return f'({escaped})'
+
+
+class KeywordMatcher:
+    """Score text against {'high': [...], 'medium': [...]} in one regex pass"""
+
+    def __init__(self, keywords_dict, weights=KEYWORD_WEIGHTS):
+        entries = {}
+        for level, keywords in keywords_dict.items():
+            weight = weights.get(level, 0)
+            for keyword in keywords:
+                key = keyword.lower()
+                # 같은 키워드가 여러 등급에 있으면 높은 가중치 사용
+                if key not in entries or weight > entries[key][1]:
+                    entries[key] = (keyword, weight)
+
+        # 긴 키워드 우선 ('data center'가 'data'보다 먼저)
+        ordered = sorted(entries, key=len, reverse=True)
+        self.keywords = [entries[key][0] for key in ordered]
+        self.weights = [entries[key][1] for key in ordered]
+        self.pattern = re.compile(
+            '|'.join(_keyword_pattern(key) for key in ordered) or r'(?!)',
+            re.IGNORECASE
+        )
+
+    def _result(self, group_indexes):
+        matched = [self.keywords[idx] for idx in sorted(group_indexes, key=group_indexes.get)]
+        score = sum(self.weights[idx] for idx in group_indexes)
+        return max(score, BASE_SCORE), matched
+
+    def score(self, title, description=''):
+        """Return (score, matched_keywords) for title+description"""
+        text = f"{title}\n{description}" if description else title
+        found = {}
+        for match in self.pattern.finditer(text):
+            found.setdefault(match.lastindex - 1, match.start())
+        return self._result(found)
+
+    def score_batch(self, articles):
+        """Score [(title, description), ...] with a single scan"""
+        texts = [f"{title}\n{description}" if description else title
+                 for title, description in articles]
+        joined = _BATCH_SEPARATOR.join(texts)
+
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + len(_BATCH_SEPARATOR)
+
+        found = [{} for _ in texts]
+        for match in self.pattern.finditer(joined):
+            article = bisect_right(starts, match.start()) - 1
+            found[article].setdefault(match.lastindex - 1, match.start())
+
+        return [self._result(groups) for groups in found]
@@ -0,0 +1,216 @@
+"""
+Market data access (yfinance bulk download)
+- 여러 종목을 한 번의 yf.download로 받아 (날짜 x 종목) 패널로 반환
+- 종목이 많으면 청크 단위로 나눠 요청, 청크 안에서는 yfinance 스레드 사용
+- 청크 1개가 DOWNLOAD_TIMEOUT을 넘기면 기다리지 않고 해당 종목은 실패 처리
+- 종목별 실패 사유 보고
+- 프로세스 내 메모이제이션: 같은 (종목, 기간, 간격)은 한 번만 다운로드
+  (두 스크립트를 한 프로세스에서 실행하면 겹치는 종목 공유)
+"""
+
+import os
+import threading
+
+import pandas as pd
+import yfinance as yf
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# yf.download 1회당 종목 수
+BULK_CHUNK_SIZE = 100
+
+# yf.download 1회 최대 대기 시간 (초), 멈춘 요청 하나가 전체 실행을 붙잡지 않도록
+DOWNLOAD_TIMEOUT = float(os.environ.get('DOWNLOAD_TIMEOUT', '120'))
+
+OHLCV_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+# ============================================================================
+# FETCH COUNTERS
+# ============================================================================
+
+# 종류별 (history: 일봉, info: 기본 정보)
+# requested: 요청된 종목 수, downloaded: 실제 다운로드한 종목 수, memo_hits: 메모에서 응답한 종목 수
+FETCH_STATS = {
+    kind: {'requested': 0, 'downloaded': 0, 'memo_hits': 0}
+    for kind in ('history', 'info')
+}
+_stats_lock = threading.Lock()
+
+
+def count_fetch(kind, requested=0, downloaded=0, memo_hits=0):
+    with _stats_lock:
+        stats = FETCH_STATS[kind]
+        stats['requested'] += requested
+        stats['downloaded'] += downloaded
+        stats['memo_hits'] += memo_hits
+
+
+def print_fetch_stats():
+    for kind, stats in FETCH_STATS.items():
+        requested = stats['requested']
+        if not requested:
+            continue
+        saved = stats['memo_hits']
+        print(f"📡 {kind}: {requested}개 종목 요청 → 다운로드 {stats['downloaded']}개, "
+              f"중복 제거 {saved}개 ({saved / requested * 100:.0f}% 절약)")
+
+
+# ============================================================================
+# BULK DOWNLOAD
+# ============================================================================
+
+def _download_with_timeout(chunk, timeout, **kwargs):
+    """
+    yf.download를 데몬 스레드에서 실행, timeout초 안에 끝나지 않으면 TimeoutError
+    - 데몬 스레드라 멈춘 요청이 있어도 프로세스 종료를 막지 않음
+    """
+    result = {}
+
+    def run():
+        try:
+            result['data'] = yf.download(chunk, **kwargs)
+        except Exception as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"{timeout:.0f}초 초과")
+    if 'error' in result:
+        raise result['error']
+    return result['data']
+
+
+def download_history(tickers, period='1y', interval='1d', start=None,
+                     chunk_size=BULK_CHUNK_SIZE, threads=True):
+    """
+    여러 종목 일괄 다운로드 → (panel, failed)
+    - panel: 컬럼 MultiIndex (필드, 티커), 인덱스는 전 종목 거래일 합집합
+    - failed: {티커: 실패 사유}
+    - start를 주면 period 대신 start 이후만 요청
+    """
+    tickers = list(dict.fromkeys(tickers))
+    frames = []
+    failed = {}
+
+    for i in range(0, len(tickers), chunk_size):
+        chunk = tickers[i:i + chunk_size]
+        try:
+            data = _download_with_timeout(
+                chunk,
+                DOWNLOAD_TIMEOUT,
+                period=None if start else period,
+                start=start,
+                interval=interval,
+                group_by='column',
+                auto_adjust=True,
+                threads=threads,
+                progress=False,
+            )
+        except Exception as e:
+            for ticker in chunk:
+                failed[ticker] = str(e)[:100]
+            continue
+
+        if data is None or data.empty:
+            for ticker in chunk:
+                failed[ticker] = '데이터 없음'
+            continue
+
+        if not isinstance(data.columns, pd.MultiIndex):
+            data.columns = pd.MultiIndex.from_product([data.columns, chunk])
+
+        # 시간 초과로 버린 이전 청크의 요청이 늦게 끝나며 섞인 종목은 제외
+        data = data.loc[:, data.columns.get_level_values(0).isin(OHLCV_FIELDS)
+                        & data.columns.get_level_values(1).isin(chunk)]
+        for ticker in chunk:
+            if ('Close', ticker) not in data.columns or data[('Close', ticker)].dropna().empty:
+                failed[ticker] = '데이터 없음'
+
+        frames.append(data)
+
+    if not frames:
+        return pd.DataFrame(), failed
+
+    panel = pd.concat(frames, axis=1).sort_index()
+    panel.columns = panel.columns.set_names(['field', 'ticker'])
+    return panel, failed
+
+
+def ticker_history(panel, ticker):
+    """panel에서 한 종목의 OHLCV (해당 종목 거래일만), 없으면 None"""
+    if panel.empty or ('Close', ticker) not in panel.columns:
+        return None
+
+    hist = panel.xs(ticker, axis=1, level='ticker').dropna(subset=['Close'])
+    return hist if not hist.empty else None
+
+
+# ============================================================================
+# MEMOIZED FETCH
+# ============================================================================
+
+_memo = {}
+_memo_lock = threading.Lock()
+
+
+def fetch_history(tickers, period='1y', interval='1d', start=None):
+    """
+    메모이제이션된 download_history → (panel, failed)
+    - 키: (ticker, start 또는 period, interval)
+    - 이번 프로세스에서 이미 받은 종목은 다시 요청하지 않음 (실패도 기억)
+    """
+    tickers = list(dict.fromkeys(tickers))
+    span = f"start={start}" if start else period
+
+    with _memo_lock:
+        missing = [ticker for ticker in tickers if (ticker, span, interval) not in _memo]
+    count_fetch('history', requested=len(tickers), downloaded=len(missing),
+                memo_hits=len(tickers) - len(missing))
+
+    if missing:
+        panel, failed = download_history(missing, period=period, interval=interval, start=start)
+        with _memo_lock:
+            for ticker in missing:
+                hist = None if ticker in failed else ticker_history(panel, ticker)
+                _memo[(ticker, span, interval)] = (hist, failed.get(ticker, '데이터 없음'))
+
+    with _memo_lock:
+        entries = {ticker: _memo[(ticker, span, interval)] for ticker in tickers}
+
+    frames = {ticker: hist for ticker, (hist, _) in entries.items() if hist is not None}
+    failed = {ticker: reason for ticker, (hist, reason) in entries.items() if hist is None}
+    if not frames:
+        return pd.DataFrame(), failed
+
+    panel = pd.concat(frames, axis=1).swaplevel(axis=1).sort_index().sort_index(axis=1)
+    panel.columns = panel.columns.set_names(['field', 'ticker'])
+    return panel, failed
+
+
+def get_history(ticker, period='1y', interval='1d'):
+    """한 종목 OHLCV (메모이제이션), 없으면 None"""
+    panel, _ = fetch_history([ticker], period=period, interval=interval)
+    return ticker_history(panel, ticker)
+
+
+_info_memo = {}
+
+
+def get_info(ticker):
+    """yf.Ticker(ticker).info (메모이제이션, 실패는 기억하지 않고 예외 그대로 전달)"""
+    with _memo_lock:
+        if ticker in _info_memo:
+            count_fetch('info', requested=1, memo_hits=1)
+            return _info_memo[ticker]
+    count_fetch('info', requested=1, downloaded=1)
+
+    info = yf.Ticker(ticker).info or {}
+    with _memo_lock:
+        _info_memo[ticker] = info
+    return info
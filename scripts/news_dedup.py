@@ -0,0 +1,170 @@
+"""
+Near-duplicate news clustering (MinHash + LSH)
+- 정규화한 제목만 사용 (요약은 매체마다 달라 같은 기사도 멀어짐)
+- 영어 불용어를 뺀 제목의 문자 3-gram 집합 자카드 유사도로 판단 (짧은 제목은 SimHash 거리 편차가 커서 사용하지 않음)
+- MinHash 서명 128개를 2개씩 64개 밴드로 나눈 LSH 인덱스로 후보만 찾고, 후보는 실제 자카드 유사도로 확인
+- 같은 기사(다른 매체/검색어/종목)를 묶고 대표 기사 1개만 남김
+"""
+
+import hashlib
+import re
+
+import numpy as np
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SHINGLE_SIZE = 3
+
+# 이 자카드 유사도 이상이면 같은 기사로 판단
+# 실제 제목 쌍 기준: 표현만 바꾼 같은 기사 0.45~0.92, 서로 다른 기사 0.40 이하
+# (회사 이름만 다른 정형 제목은 구분 못 함 - 예: "X signs nuclear power deal for data centers")
+MIN_JACCARD = 0.42
+
+MINHASH_PERMUTATIONS = 128
+
+# 밴드당 2행 → 자카드 0.3인 쌍도 후보가 될 확률 99% 이상 (오탐은 자카드 확인에서 제거)
+LSH_BANDS = 64
+
+# 범용 해시 (a * x + b) mod p, 실행마다 같은 서명이 나오도록 고정 시드
+_PRIME = (1 << 61) - 1
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(1, 1 << 31, MINHASH_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.integers(0, 1 << 31, MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+
+# ============================================================================
+# FINGERPRINT
+# ============================================================================
+
+# Google News 제목 끝의 " - 매체명" 제거
+_PUBLISHER_SUFFIX = re.compile(r'\s+[-|–]\s+[^-|–]{1,40}$')
+_HTML_TAG = re.compile(r'<[^>]+>|&[a-z]+;|&#\d+;')
+_WORD = re.compile(r'\w+')
+
+# 제목마다 들어가는 기능어 (남겨두면 다른 기사끼리 겹치는 3-gram이 늘어남)
+STOPWORDS = frozenset(
+    'a an the to in on of for and as at by with after from will is are its new'.split()
+)
+
+
+def normalize_text(title):
+    title = _PUBLISHER_SUFFIX.sub('', title or '')
+    return [word for word in _WORD.findall(_HTML_TAG.sub(' ', title).lower()) if word not in STOPWORDS]
+
+
+def shingles(words, size=SHINGLE_SIZE):
+    """단어를 공백으로 이은 문자열의 문자 n-gram 집합 (띄어쓰기가 다른 한글 제목도 겹치도록)"""
+    text = ' '.join(words)
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def minhash(shingle_set):
+    """MINHASH_PERMUTATIONS개 최솟값 서명 (uint64 배열)"""
+    if not shingle_set:
+        return np.full(MINHASH_PERMUTATIONS, _PRIME, dtype=np.uint64)
+
+    values = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'big') for s in shingle_set),
+        dtype=np.uint64, count=len(shingle_set)
+    )
+    # (순열 x 특징) 해시 → 순열별 최솟값 (a < 2^31, x < 2^32 → uint64 범위 안)
+    hashed = (_A[:, None] * values[None, :] + _B[:, None]) % _PRIME
+    return hashed.min(axis=1)
+
+
+# ============================================================================
+# LSH INDEX
+# ============================================================================
+
+class MinHashIndex:
+    """Band-partitioned index answering 'shingle sets with Jaccard >= min_jaccard'"""
+
+    def __init__(self, min_jaccard=MIN_JACCARD, bands=LSH_BANDS):
+        self.min_jaccard = min_jaccard
+        self.bands = bands
+        self.rows = MINHASH_PERMUTATIONS // bands
+        self.buckets = [dict() for _ in range(bands)]
+        self.shingles = {}
+
+    def _band_keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def query(self, shingle_set, signature):
+        """Keys of indexed titles at or above min_jaccard"""
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self.buckets[band].get(key, ()))
+        return [key for key in candidates
+                if jaccard(self.shingles[key], shingle_set) >= self.min_jaccard]
+
+    def add(self, key, shingle_set, signature):
+        self.shingles[key] = shingle_set
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self.buckets[band].setdefault(band_key, []).append(key)
+
+
+# ============================================================================
+# CLUSTERING
+# ============================================================================
+
+def _rank(article):
+    return (article.get('score', 0), article['date'])
+
+
+def cluster_articles(articles, min_jaccard=MIN_JACCARD, seen_index=None):
+    """
+    Collapse near-duplicates, keeping the best-ranked article of each cluster
+    - 대표 기사: (score, date)가 가장 큰 기사, 동점이면 먼저 나온 기사
+    - 반환 순서는 각 클러스터의 첫 기사 순서 (입력 순서가 같으면 결과도 같음)
+    - 대표 기사에 'duplicates' (묶인 다른 기사 수) 기록
+    - seen_index를 넘기면 이전 배치에서 이미 남긴 기사와 겹치는 기사는 버리고,
+      이번 대표 기사를 seen_index에 추가 (배치를 순서대로 흘려보낼 때)
+    """
+    index = MinHashIndex(min_jaccard)
+    shingle_sets = [shingles(normalize_text(article['title'])) for article in articles]
+    signatures = [minhash(shingle_set) for shingle_set in shingle_sets]
+    parent = list(range(len(articles)))
+    kept = []
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, (shingle_set, signature) in enumerate(zip(shingle_sets, signatures)):
+        if seen_index is not None and seen_index.query(shingle_set, signature):
+            continue
+        kept.append(i)
+        for j in index.query(shingle_set, signature):
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+        index.add(i, shingle_set, signature)
+
+    clusters = {}
+    for i in kept:
+        clusters.setdefault(find(i), []).append(i)
+
+    representatives = []
+    for root in sorted(clusters):
+        members = clusters[root]
+        best = members[0]
+        for i in members[1:]:
+            if _rank(articles[i]) > _rank(articles[best]):
+                best = i
+        articles[best]['duplicates'] = len(members) - 1
+        representatives.append(articles[best])
+        if seen_index is not None:
+            seen_index.add(len(seen_index.shingles), shingle_sets[best], signatures[best])
+
+    return representatives
@@ -0,0 +1,73 @@
+"""
+Streaming stage pipeline
+- 각 스테이지는 generator 함수: stage(upstream, context) → 결과를 하나씩 yield
+- 스테이지를 연결하면 앞 단계 결과가 나오는 즉시 다음 단계가 처리 (단계 간 중첩)
+- 스테이지별 순수 처리 시간(앞 단계 대기 시간 제외) 측정, 개별 벤치마크 지원
+"""
+
+import time
+from collections import defaultdict
+
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+def _timed_stage(name, stage, upstream, context, timings):
+    """Run a stage, charging it only for time not spent waiting on upstream"""
+    waited = [0.0]
+
+    def pull():
+        iterator = iter(upstream)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                waited[0] += time.perf_counter() - start
+                return
+            waited[0] += time.perf_counter() - start
+            yield item
+
+    generator = stage(pull(), context)
+    while True:
+        start = time.perf_counter()
+        waited_before = waited[0]
+        try:
+            item = next(generator)
+        except StopIteration:
+            timings[name] += time.perf_counter() - start - (waited[0] - waited_before)
+            return
+        timings[name] += time.perf_counter() - start - (waited[0] - waited_before)
+        yield item
+
+
+def run_pipeline(source, stages, context, timings=None):
+    """
+    Chain (name, stage) pairs onto a source iterable, return the final iterator
+    - timings(dict)를 넘기면 스테이지 이름별 처리 시간(초)을 누적
+    """
+    stream = source
+    for name, stage in stages:
+        if timings is None:
+            stream = stage(stream, context)
+        else:
+            stream = _timed_stage(name, stage, stream, context, timings)
+    return stream
+
+
+def benchmark_stage(stage, inputs, context, repeat=1):
+    """
+    Run one stage on materialized inputs, return (outputs, seconds per run)
+    - 앞 단계 출력을 list로 저장해 두고 스테이지 하나만 반복 측정할 때 사용
+    """
+    inputs = list(inputs)
+    outputs = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        outputs = list(stage(iter(inputs), context))
+    return outputs, (time.perf_counter() - start) / repeat
+
+
+def new_timings():
+    return defaultdict(float)
@@ -0,0 +1,286 @@
+"""
+Local OHLCV cache (SQLite, 일봉)
+- (ticker, date) PRIMARY KEY → 종목별로 모여 저장되는 append-only 테이블
+- 종목별 마지막 저장일 이후 봉만 다운로드 (겹치는 구간 몇 개 포함)
+- 겹치는 구간 종가가 달라졌으면(분할/배당 수정주가 반영) 해당 종목 전체 재다운로드
+- 다운로드 실패/오프라인이면 저장된 데이터로 응답
+- 한 프로세스 안에서 이미 갱신한 종목은 다시 확인하지 않음
+"""
+
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from market_data import OHLCV_FIELDS, count_fetch, fetch_history, ticker_history
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+OHLCV_CACHE_DB = os.environ.get('OHLCV_CACHE_DB', 'ohlcv_cache.db')
+
+# OHLCV_OFFLINE=1 이면 다운로드 없이 캐시만 사용
+OHLCV_OFFLINE = os.environ.get('OHLCV_OFFLINE', '') == '1'
+
+# 증분 다운로드 시 다시 받아 비교할 기존 봉 수
+OVERLAP_BARS = 5
+
+# 겹치는 구간 종가 허용 오차 (상대값)
+ADJUSTMENT_TOLERANCE = 1e-3
+
+PERIOD_DAYS = {
+    '1mo': 31, '3mo': 92, '6mo': 183,
+    '1y': 366, '2y': 731, '5y': 1827, '10y': 3653,
+}
+
+_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# 이번 프로세스에서 갱신을 마친 종목: {ticker: 갱신한 기간의 시작일}
+_refreshed = {}
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+class OHLCVCache:
+    """Daily bars per ticker plus the date range already fully downloaded"""
+
+    def __init__(self, path=OHLCV_CACHE_DB):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS ohlcv ("
+            " ticker TEXT NOT NULL,"
+            " date TEXT NOT NULL,"
+            " open REAL, high REAL, low REAL, close REAL, volume REAL,"
+            " PRIMARY KEY (ticker, date)"
+            ") WITHOUT ROWID"
+        )
+        # covered_from: 이 날짜 이후는 빠짐없이 받아 둔 상태
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS ohlcv_meta ("
+            " ticker TEXT PRIMARY KEY,"
+            " covered_from TEXT NOT NULL,"
+            " updated REAL NOT NULL"
+            ")"
+        )
+        # indicator_state 모듈의 종목별 증분 지표 상태 (JSON)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS indicator_state ("
+            " ticker TEXT PRIMARY KEY,"
+            " last_date TEXT NOT NULL,"
+            " state TEXT NOT NULL"
+            ")"
+        )
+        self.conn.commit()
+
+    def coverage(self, tickers):
+        """{ticker: (covered_from, last_date)} for cached tickers"""
+        placeholders = ','.join('?' * len(tickers))
+        rows = self.conn.execute(
+            f"SELECT m.ticker, m.covered_from, MAX(o.date) FROM ohlcv_meta m"
+            f" JOIN ohlcv o ON o.ticker = m.ticker"
+            f" WHERE m.ticker IN ({placeholders}) GROUP BY m.ticker",
+            list(tickers)
+        ).fetchall()
+        return {ticker: (covered_from, last_date) for ticker, covered_from, last_date in rows}
+
+    def overlap_start(self, ticker, bars=OVERLAP_BARS):
+        """Date of the n-th most recent cached bar"""
+        rows = self.conn.execute(
+            "SELECT date FROM ohlcv WHERE ticker = ? ORDER BY date DESC LIMIT ?",
+            (ticker, bars)
+        ).fetchall()
+        return rows[-1][0] if rows else None
+
+    def read(self, tickers, start=None):
+        """Panel with (field, ticker) columns like market_data.download_history"""
+        placeholders = ','.join('?' * len(tickers))
+        query = f"SELECT * FROM ohlcv WHERE ticker IN ({placeholders})"
+        params = list(tickers)
+        if start:
+            query += " AND date >= ?"
+            params.append(start)
+
+        rows = pd.read_sql_query(query, self.conn, params=params)
+        if rows.empty:
+            return pd.DataFrame()
+
+        rows['date'] = pd.to_datetime(rows['date'])
+        panel = rows.pivot(index='date', columns='ticker', values=_COLUMNS)
+        panel.columns = panel.columns.set_levels(
+            [field.capitalize() for field in panel.columns.levels[0]], level=0
+        )
+        panel.columns = panel.columns.set_names(['field', 'ticker'])
+        return panel.sort_index()
+
+    def write(self, ticker, hist, covered_from=None, replace=False):
+        """Upsert bars from an OHLCV frame (index: dates)"""
+        hist = hist.dropna(subset=['Close'])
+        rows = [
+            (ticker, date.strftime('%Y-%m-%d'), *(None if pd.isna(v) else float(v) for v in values))
+            for date, values in zip(hist.index, hist[OHLCV_FIELDS].itertuples(index=False))
+        ]
+
+        if replace:
+            self.conn.execute("DELETE FROM ohlcv WHERE ticker = ?", (ticker,))
+            self.conn.execute("DELETE FROM indicator_state WHERE ticker = ?", (ticker,))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO ohlcv (ticker, date, open, high, low, close, volume)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        if covered_from:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO ohlcv_meta (ticker, covered_from, updated) VALUES (?, ?, ?)",
+                (ticker, covered_from, time.time())
+            )
+        else:
+            self.conn.execute("UPDATE ohlcv_meta SET updated = ? WHERE ticker = ?", (time.time(), ticker))
+        self.conn.commit()
+
+    def invalidate(self, ticker):
+        self.conn.execute("DELETE FROM ohlcv WHERE ticker = ?", (ticker,))
+        self.conn.execute("DELETE FROM ohlcv_meta WHERE ticker = ?", (ticker,))
+        self.conn.execute("DELETE FROM indicator_state WHERE ticker = ?", (ticker,))
+        self.conn.commit()
+
+    def closes_volumes(self, tickers):
+        """(ticker, date, close, volume) rows for the full cached history, by ticker then date"""
+        placeholders = ','.join('?' * len(tickers))
+        return self.conn.execute(
+            f"SELECT ticker, date, close, volume FROM ohlcv WHERE ticker IN ({placeholders})"
+            f" AND close IS NOT NULL ORDER BY ticker, date",
+            list(tickers)
+        ).fetchall()
+
+    def closes_volumes_since_state(self, tickers):
+        """Same rows, starting at each ticker's saved indicator state date (inclusive)"""
+        placeholders = ','.join('?' * len(tickers))
+        return self.conn.execute(
+            f"SELECT o.ticker, o.date, o.close, o.volume FROM ohlcv o"
+            f" JOIN indicator_state s ON s.ticker = o.ticker AND o.date >= s.last_date"
+            f" WHERE o.ticker IN ({placeholders}) AND o.close IS NOT NULL"
+            f" ORDER BY o.ticker, o.date",
+            list(tickers)
+        ).fetchall()
+
+    def indicator_states(self, tickers):
+        """{ticker: state JSON} for tickers with a saved indicator state"""
+        placeholders = ','.join('?' * len(tickers))
+        rows = self.conn.execute(
+            f"SELECT ticker, state FROM indicator_state WHERE ticker IN ({placeholders})",
+            list(tickers)
+        ).fetchall()
+        return dict(rows)
+
+    def save_indicator_states(self, rows):
+        """Upsert [(ticker, last_date, state JSON)]"""
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO indicator_state (ticker, last_date, state) VALUES (?, ?, ?)",
+            rows
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def _overlap_matches(cache, ticker, new_hist):
+    """True if re-downloaded bars agree with cached closes (last cached bar excluded)"""
+    start = new_hist.index.min().strftime('%Y-%m-%d')
+    cached = cache.read([ticker], start)
+    if cached.empty:
+        return True
+
+    old_close = cached[('Close', ticker)].dropna().iloc[:-1]
+    new_close = new_hist['Close'].reindex(old_close.index).dropna()
+    if new_close.empty:
+        return True
+
+    diff = ((new_close - old_close.loc[new_close.index]).abs() / old_close.loc[new_close.index]).max()
+    return diff <= ADJUSTMENT_TOLERANCE
+
+
+def update_history(tickers, period='1y', cache=None, offline=OHLCV_OFFLINE):
+    """
+    캐시를 최신 상태로 갱신 → {ticker: 다운로드 실패 사유}
+    - 캐시에 없거나 기간이 모자란 종목: period 전체 다운로드
+    - 캐시에 있는 종목: 마지막 저장일 부근부터 증분 다운로드 (시작일별로 묶어서 일괄 요청)
+    - 겹치는 구간 불일치(수정주가 변경): 해당 종목 전체 재다운로드
+    """
+    tickers = list(dict.fromkeys(tickers))
+    own_cache = cache is None
+    cache = cache or OHLCVCache()
+    need_from = (datetime.now() - timedelta(days=PERIOD_DAYS.get(period, 366))).strftime('%Y-%m-%d')
+    today = datetime.now().strftime('%Y-%m-%d')
+    failed = {}
+
+    # 같은 프로세스에서 이미 더 긴 기간으로 갱신한 종목은 건너뜀
+    done = [ticker for ticker in tickers if _refreshed.get(ticker, '9999') <= need_from]
+    if done:
+        count_fetch('history', requested=len(done), memo_hits=len(done))
+        tickers = [ticker for ticker in tickers if ticker not in done]
+
+    if not offline and tickers:
+        coverage = cache.coverage(tickers)
+        full = []
+        incremental = {}
+
+        for ticker in tickers:
+            covered_from, last_date = coverage.get(ticker, (None, None))
+            if covered_from is None or covered_from > need_from:
+                full.append(ticker)
+            elif last_date < today:
+                incremental.setdefault(cache.overlap_start(ticker), []).append(ticker)
+
+        for start, group in incremental.items():
+            panel, group_failed = fetch_history(group, start=start)
+            for ticker in group:
+                hist = None if ticker in group_failed else ticker_history(panel, ticker)
+                if hist is None:
+                    continue
+                if _overlap_matches(cache, ticker, hist):
+                    cache.write(ticker, hist)
+                else:
+                    full.append(ticker)
+
+        if full:
+            panel, full_failed = fetch_history(full, period=period)
+            failed.update(full_failed)
+            for ticker in full:
+                hist = ticker_history(panel, ticker)
+                if hist is not None:
+                    cache.write(ticker, hist, covered_from=need_from, replace=True)
+
+        for ticker in tickers:
+            _refreshed[ticker] = min(need_from, _refreshed.get(ticker, need_from))
+
+    if own_cache:
+        cache.close()
+    return failed
+
+
+def load_history(tickers, period='1y', cache=None, offline=OHLCV_OFFLINE):
+    """
+    캐시 우선 일봉 조회 → (panel, failed)
+    - update_history로 캐시 갱신 후 period 구간을 캐시에서 읽어 반환
+    """
+    tickers = list(dict.fromkeys(tickers))
+    own_cache = cache is None
+    cache = cache or OHLCVCache()
+    need_from = (datetime.now() - timedelta(days=PERIOD_DAYS.get(period, 366))).strftime('%Y-%m-%d')
+
+    failed = update_history(tickers, period, cache=cache, offline=offline)
+    panel = cache.read(tickers, need_from)
+    if own_cache:
+        cache.close()
+
+    cached = set(panel.columns.get_level_values('ticker')) if not panel.empty else set()
+    failed = {ticker: failed.get(ticker, '캐시/다운로드 데이터 없음')
+              for ticker in tickers if ticker not in cached}
+    return panel, failed
@@ -0,0 +1,83 @@
+"""
+Per-host rate limiting (token bucket)
+- 고정 sleep 대신 호스트별 허용 속도만큼만 요청을 내보냄
+- 여러 스레드에서 동시에 호출해도 안전
+"""
+
+import threading
+import time
+from urllib.parse import urlparse
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# host: (초당 요청 수, 버스트 허용량)
+HOST_RATE_LIMITS = {
+    'news.google.com': (2.0, 4),
+    'openapi.naver.com': (8.0, 8),
+    # 텔레그램 봇 전체 한도 (초당 약 30건)
+    'api.telegram.org': (30.0, 30),
+}
+
+
+# ============================================================================
+# TOKEN BUCKET
+# ============================================================================
+
+class TokenBucket:
+    """Thread-safe token bucket"""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self.updated
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens=1):
+        """토큰이 생길 때까지 대기 후 소비, 대기한 시간(초) 반환"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(host):
+    """Return the shared bucket for a host (None if the host is unlimited)"""
+    limit = HOST_RATE_LIMITS.get(host)
+    if limit is None:
+        return None
+
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(*limit)
+            _buckets[host] = bucket
+        return bucket
+
+
+def acquire(url_or_host):
+    """URL 또는 호스트 이름으로 토큰 1개 획득 (제한 없는 호스트는 즉시 반환)"""
+    host = urlparse(url_or_host).hostname if '://' in url_or_host else url_or_host
+    bucket = get_bucket(host)
+    if bucket is None:
+        return 0.0
+    return bucket.acquire()
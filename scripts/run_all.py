@@ -0,0 +1,42 @@
+"""
+종목 선정 + 일일 리포트 통합 실행
+- 두 스크립트를 한 프로세스에서 차례로 실행해 market_data 메모를 공유
+  (겹치는 종목의 시세/기본 정보는 한 번만 다운로드)
+- 실행 후 전체 다운로드 절약 통계 출력
+"""
+
+import os
+import runpy
+import sys
+
+from market_data import print_fetch_stats
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SCRIPTS = [
+    'stock_selection_system.py',
+    'datacenter_report_enhanced.py',
+]
+
+
+def main():
+    failed = []
+    for script in SCRIPTS:
+        try:
+            runpy.run_path(os.path.join(SCRIPT_DIR, script), run_name='__main__')
+        except Exception as e:
+            print(f"\n❌ {script} 실패: {str(e)[:100]}")
+            failed.append(script)
+
+    print("\n" + "="*70)
+    print("📡 통합 실행 시세 요청 통계")
+    print("="*70)
+    print_fetch_stats()
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Selection score (100점 만점)
+- 구간별 배점표를 데이터로 정의 → 종목 1개(스칼라)든 (날짜 x 종목) 배열이든 같은 식으로 계산
+- 종목 선정(calculate_selection_score)과 백테스트가 함께 사용
+"""
+
+import numpy as np
+
+
+# ============================================================================
+# SCORE TABLES
+# ============================================================================
+
+# 구간 배점: (하한 이상이면 해당 점수, 높은 구간부터), 어느 구간에도 안 들면 default
+MARKET_CAP_TIERS = [            # 시가총액 (30점)
+    (100_000_000_000, 30),      # 1000억 달러 이상
+    (50_000_000_000, 25),       # 500억 달러 이상
+    (10_000_000_000, 20),       # 100억 달러 이상
+    (5_000_000_000, 15),        # 50억 달러 이상
+    (1_000_000_000, 10),        # 10억 달러 이상
+]
+MARKET_CAP_DEFAULT = 5
+
+VOLUME_TREND_TIERS = [          # 거래량 20일/60일 (20점)
+    (1.5, 20),                  # 최근 거래량 급증
+    (1.2, 15),
+    (1.0, 10),
+]
+VOLUME_TREND_DEFAULT = 5
+
+RETURN_3M_TIERS = [             # 3개월 수익률 (20점)
+    (30, 20),
+    (20, 17),
+    (10, 14),
+    (0, 10),
+    (-10, 5),
+]
+RETURN_3M_DEFAULT = 0           # 마이너스 크면 0점
+
+RETURN_6M_TIERS = [             # 6개월 수익률 (15점)
+    (40, 15),
+    (25, 12),
+    (10, 9),
+    (0, 6),
+    (-15, 3),
+]
+RETURN_6M_DEFAULT = 0
+
+# 기술적 지표 (15점)
+GOLDEN_CROSS_POINTS = 6
+RSI_NEUTRAL_BAND = (40, 60)     # 중립구간 (좋음)
+RSI_NEUTRAL_POINTS = 6
+RSI_WIDE_BAND = (30, 70)
+RSI_WIDE_POINTS = 3
+ABOVE_MA20_POINTS = 3           # 20일선 위
+
+
+# 점수 구성 요소 → (입력 지표, 구간표, 기본 점수), technical은 별도 계산
+TIERED_COMPONENTS = {
+    'market_cap': ('market_cap', MARKET_CAP_TIERS, MARKET_CAP_DEFAULT),
+    'volume_trend': ('volume_trend', VOLUME_TREND_TIERS, VOLUME_TREND_DEFAULT),
+    'return_3m': ('return_3m', RETURN_3M_TIERS, RETURN_3M_DEFAULT),
+    'return_6m': ('return_6m', RETURN_6M_TIERS, RETURN_6M_DEFAULT),
+}
+COMPONENTS = list(TIERED_COMPONENTS) + ['technical']
+
+
+# ============================================================================
+# SCORING
+# ============================================================================
+
+def tier_points(values, tiers, default, scale=1.0):
+    """
+    구간 배점 적용 (NaN은 default), 스칼라/배열 모두 가능
+    - scale: 구간 하한에 곱할 배수 (그리드 탐색용, 1.0 = 기본 배점표)
+    """
+    values = np.asarray(values, dtype=float)
+    points = np.full(values.shape, float(default))
+    # 낮은 구간부터 덮어써서 가장 높은 만족 구간이 남도록
+    for threshold, score in reversed(tiers):
+        points = np.where(values >= threshold * scale, float(score), points)
+    return points
+
+
+def technical_points(golden_cross, rsi, price_vs_ma20):
+    """골든크로스 + RSI 구간 + 20일선 위치 (15점)"""
+    rsi = np.asarray(rsi, dtype=float)
+    points = np.where(np.asarray(golden_cross, dtype=bool), float(GOLDEN_CROSS_POINTS), 0.0)
+
+    neutral = (rsi >= RSI_NEUTRAL_BAND[0]) & (rsi <= RSI_NEUTRAL_BAND[1])
+    wide = (rsi >= RSI_WIDE_BAND[0]) & (rsi <= RSI_WIDE_BAND[1])
+    points = points + np.where(neutral, RSI_NEUTRAL_POINTS, np.where(wide, RSI_WIDE_POINTS, 0))
+
+    return points + np.where(np.asarray(price_vs_ma20, dtype=float) > 0, ABOVE_MA20_POINTS, 0)
+
+
+def component_points(component, features, scale=1.0):
+    """
+    구성 요소 1개의 점수
+    - features: {'market_cap', 'volume_trend', 'return_3m', 'return_6m', 'golden_cross', 'rsi', 'price_vs_ma20'}
+    - scale: 구간 하한 배수 (technical은 무시)
+    """
+    if component == 'technical':
+        return technical_points(features['golden_cross'], features['rsi'], features['price_vs_ma20'])
+    feature, tiers, default = TIERED_COMPONENTS[component]
+    return tier_points(features[feature], tiers, default, scale)
+
+
+def selection_score(market_cap, volume_trend, return_3m, return_6m,
+                    golden_cross, rsi, price_vs_ma20):
+    """
+    선정 점수 (입력과 같은 모양의 배열, 스칼라 입력이면 0차원 배열)
+    - price_vs_ma20: (현재가 / 20일선 - 1) * 100
+    """
+    features = {
+        'market_cap': market_cap, 'volume_trend': volume_trend,
+        'return_3m': return_3m, 'return_6m': return_6m,
+        'golden_cross': golden_cross, 'rsi': rsi, 'price_vs_ma20': price_vs_ma20,
+    }
+    return sum(component_points(component, features) for component in COMPONENTS)
@@ -0,0 +1,181 @@
+"""
+Candidate screening pipeline (싼 필터부터)
+1. 시가총액 범위 (fundamentals/환율 캐시의 유효 기간 안 값만, 네트워크 없음)
+2. 가격 이력 길이 (OHLCV 캐시 + 일괄 다운로드)
+3. 유동성 (최근 20봉 평균 거래대금)
+4. 시가총액 범위 (만료된 값만 새로 조회)
+- 통과한 종목만 종목 선정의 점수 계산 대상
+- 단계별 탈락 수와 소요 시간 보고
+
+금액 기준은 달러 (거래 통화 금액을 fx_rates로 일괄 환산해 비교)
+"""
+
+import os
+import time
+import warnings
+
+import numpy as np
+
+from fundamentals import FundamentalsCache, is_fresh, load_fundamentals
+from fx_rates import ticker_currency, to_usd
+from indicators import align_recent, compute_from_panel
+from ohlcv_cache import load_history
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# calculate_selection_score와 같은 최소 봉 수 (6개월)
+MIN_BARS = 126
+
+# 시가총액 범위 (달러, 0이면 제한 없음)
+MIN_MARKET_CAP = float(os.environ.get('SCREEN_MIN_MARKET_CAP', '300000000'))
+MAX_MARKET_CAP = float(os.environ.get('SCREEN_MAX_MARKET_CAP', '0'))
+
+# 최근 20봉 평균 거래대금 (종가 x 거래량, 달러)
+MIN_TRADED_VALUE = float(os.environ.get('SCREEN_MIN_TRADED_VALUE', '1000000'))
+LIQUIDITY_BARS = 20
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+class ScreeningReport:
+    """Per-stage candidate counts and timings"""
+
+    def __init__(self):
+        self.stages = []
+
+    def record(self, stage, before, after, seconds):
+        self.stages.append({'stage': stage, 'before': before, 'eliminated': before - after,
+                            'after': after, 'seconds': seconds})
+
+    def print(self):
+        print("\n🔎 스크리닝 단계별 결과")
+        for row in self.stages:
+            print(f"  {row['stage']:12s} {row['before']:5d} → {row['after']:5d}개 "
+                  f"(탈락 {row['eliminated']:4d}) | {row['seconds']:.2f}초")
+
+
+def _in_band(market_cap):
+    if market_cap is None:
+        return True
+    if MIN_MARKET_CAP and market_cap < MIN_MARKET_CAP:
+        return False
+    return not (MAX_MARKET_CAP and market_cap > MAX_MARKET_CAP)
+
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+def average_traded_value(panel, bars=LIQUIDITY_BARS):
+    """{ticker: 각 종목 최근 bars봉 평균 거래대금}"""
+    if panel.empty:
+        return {}
+    close, volume = panel['Close'], panel['Volume']
+    c, v, _ = align_recent(close, volume, bars)
+    with warnings.catch_warnings():
+        # 봉이 없는 종목은 NaN (유동성 단계에서 탈락)
+        warnings.simplefilter('ignore', RuntimeWarning)
+        traded = np.nanmean(c * v, axis=0)
+    return dict(zip(close.columns, traded))
+
+
+def screen_candidates(pools, report=None):
+    """
+    후보 스크리닝 → dict
+    - survivors: 통과 종목 set
+    - eliminated: {ticker: 탈락 사유}
+    - indicators: 통과 종목 지표 (indicators.compute_indicators 형식)
+    - fundamentals: {ticker: {field: value}}
+    - report: ScreeningReport
+    """
+    report = report or ScreeningReport()
+    tickers = list(dict.fromkeys(c['ticker'] for candidates in pools.values() for c in candidates))
+    eliminated = {}
+
+    def stage(name, candidates, check):
+        start = time.perf_counter()
+        survivors = []
+        for ticker, reason in check(candidates):
+            if reason:
+                eliminated[ticker] = reason
+            else:
+                survivors.append(ticker)
+        report.record(name, len(candidates), len(survivors), time.perf_counter() - start)
+        return survivors
+
+    # 거래 통화 (캐시된 값, 없으면 티커 접미사)
+    currencies = {}
+
+    # 1. 캐시된 시가총액 (유효 기간 안의 값으로만 탈락 판정)
+    def cached_market_cap(candidates):
+        cache = FundamentalsCache()
+        cached = cache.read(candidates)
+        cache.close()
+        for ticker in candidates:
+            entry = cached.get(ticker, {}).get('currency')
+            currencies[ticker] = ticker_currency(ticker, entry[0] if entry else None)
+        # 만료/누락 값은 판단 보류 (통과시켜 4단계에서 새로 조회)
+        # 환율도 캐시만 사용 → 유효한 환율이 없는 통화의 종목은 NaN이라 통과
+        now = time.time()
+        fresh = {ticker: cached.get(ticker, {}).get('market_cap') for ticker in candidates}
+        fresh = {ticker: entry[0] if is_fresh(entry, 'market_cap', now) else None for ticker, entry in fresh.items()}
+        market_caps = to_usd(fresh, currencies, cached_only=True)
+        for ticker in candidates:
+            value = market_caps[ticker]
+            yield ticker, None if _in_band(None if np.isnan(value) else value) else '시가총액 범위 밖'
+
+    survivors = stage('시가총액(캐시)', tickers, cached_market_cap)
+
+    # 2. 가격 이력 (일괄 다운로드 시간 포함)
+    prices = {}
+
+    def history_length(candidates):
+        panel, failed = load_history(candidates, period="1y")
+        prices['panel'] = panel
+        prices['indicators'] = indicators = compute_from_panel(panel)
+        for ticker in candidates:
+            if ticker not in indicators.index:
+                yield ticker, failed.get(ticker, '가격 데이터 없음')
+            elif indicators.at[ticker, 'bars'] < MIN_BARS:
+                yield ticker, f"가격 이력 부족 ({int(indicators.at[ticker, 'bars'])}봉)"
+            else:
+                yield ticker, None
+
+    survivors = stage('가격 이력', survivors, history_length)
+    indicators = prices['indicators']
+
+    # 3. 유동성
+    def liquidity(candidates):
+        traded_value = to_usd(average_traded_value(prices['panel']), currencies).fillna(0)
+        for ticker in candidates:
+            value = traded_value.get(ticker, 0)
+            yield ticker, None if value >= MIN_TRADED_VALUE else '거래대금 부족'
+
+    survivors = stage('유동성', survivors, liquidity)
+
+    # 4. 시가총액 (만료된 값만 새로 조회)
+    fundamentals = {}
+
+    def fresh_market_cap(candidates):
+        loaded, stats = load_fundamentals(candidates, prices=indicators['price'].reindex(candidates).to_dict())
+        if stats['timeout']:
+            print(f"⏱️ 기본 정보 조회 시간 초과 {stats['timeout']}개 (캐시 값으로 진행)")
+        fundamentals.update(loaded)
+        for ticker in candidates:
+            market_cap = loaded.get(ticker, {}).get('market_cap_usd')
+            yield ticker, None if _in_band(market_cap) else '시가총액 범위 밖'
+
+    survivors = stage('시가총액', survivors, fresh_market_cap)
+
+    return {
+        'survivors': set(survivors),
+        'eliminated': eliminated,
+        'indicators': indicators.loc[indicators.index.intersection(survivors)],
+        'fundamentals': fundamentals,
+        'report': report,
+    }
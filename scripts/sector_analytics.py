@@ -0,0 +1,196 @@
+"""
+Sector analytics (섹터 지수 + 위험 지표)
+- 종목별 일간 수익률(자기 거래일 기준)을 (날짜 x 종목) 배열 하나로 계산
+- 섹터 지수: 동일가중 또는 시가총액가중 (그날 거래한 종목만으로 가중치 재조정)
+- 섹터/종목별 변동성(연환산), 최대 낙폭, 벤치마크 대비 베타, 종목 간 상관계수
+- 일일 리포트가 텔레그램 섹터 요약과 내보내기 표로 사용
+"""
+
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from fundamentals import FundamentalsCache
+from fx_rates import ticker_currency, to_usd
+from ohlcv_cache import load_history
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+BENCHMARK = os.environ.get('SECTOR_BENCHMARK', 'SPY')
+
+# 'equal' 또는 'cap' (캐시된 시가총액, 없는 종목은 섹터 평균 시가총액으로 대체)
+SECTOR_WEIGHTING = os.environ.get('SECTOR_WEIGHTING', 'equal')
+
+VOLATILITY_WINDOW = 20
+CORRELATION_WINDOW = 60
+TRADING_DAYS = 252
+
+# 1개월 수익률 기간 (indicators.change_1m과 동일)
+MONTH_BARS = 21
+
+
+# ============================================================================
+# RETURNS / INDICES
+# ============================================================================
+
+def daily_returns(close):
+    """(날짜 x 종목) 종가 → 일간 수익률 (직전 거래일 대비, 거래 없는 날은 NaN)"""
+    previous = close.ffill().shift(1)
+    return close / previous - 1
+
+
+def sector_returns(returns, sectors, weights=None):
+    """
+    종목 수익률 → (날짜 x 섹터) 섹터 수익률
+    - sectors: {ticker: sector}
+    - weights: {ticker: 가중치} (None이면 동일가중)
+    """
+    tickers = list(returns.columns)
+    names = list(dict.fromkeys(sectors[ticker] for ticker in tickers))
+    membership = np.zeros((len(tickers), len(names)))
+    membership[np.arange(len(tickers)), [names.index(sectors[ticker]) for ticker in tickers]] = 1.0
+
+    w = np.array([1.0 if weights is None else weights.get(ticker, 1.0) for ticker in tickers])
+    r = returns.to_numpy()
+    traded = np.isfinite(r)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        combined = (np.where(traded, r, 0.0) * w) @ membership / ((traded * w) @ membership)
+    return pd.DataFrame(combined, index=returns.index, columns=names)
+
+
+def index_levels(returns, base=100.0):
+    """수익률 → 지수 (거래 없는 날은 전일 수준 유지)"""
+    return base * (1 + returns.fillna(0)).cumprod()
+
+
+def cap_weights(tickers, sectors):
+    """캐시된 시가총액(달러 환산) 가중치, 없는 종목은 같은 섹터 평균"""
+    cache = FundamentalsCache()
+    cached = cache.read(tickers)
+    cache.close()
+
+    caps = pd.Series({ticker: cached.get(ticker, {}).get('market_cap', (np.nan,))[0] for ticker in tickers},
+                     dtype=float)
+    caps = to_usd(caps, {ticker: ticker_currency(ticker, cached.get(ticker, {}).get('currency', (None,))[0])
+                         for ticker in tickers})
+    sector = pd.Series(sectors).reindex(caps.index)
+    caps = caps.fillna(caps.groupby(sector).transform('mean')).fillna(1.0)
+    return caps.to_dict()
+
+
+# ============================================================================
+# RISK METRICS
+# ============================================================================
+
+def rolling_volatility(returns, window=VOLATILITY_WINDOW):
+    """연환산 변동성 (%)"""
+    return returns.rolling(window, min_periods=window // 2).std() * np.sqrt(TRADING_DAYS) * 100
+
+
+def max_drawdown(levels):
+    """기간 중 최대 낙폭 (%), 컬럼별"""
+    return (levels / levels.cummax() - 1).min() * 100
+
+
+def beta(returns, benchmark):
+    """벤치마크 대비 베타 (둘 다 거래한 날만 사용), 컬럼별"""
+    x = returns.to_numpy()
+    y = benchmark.reindex(returns.index).to_numpy()[:, None]
+    both = np.isfinite(x) & np.isfinite(y)
+    n = both.sum(axis=0)
+
+    with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+        warnings.simplefilter('ignore', RuntimeWarning)
+        xm = np.where(both, x, 0.0).sum(axis=0) / n
+        ym = np.where(both, y, 0.0).sum(axis=0) / n
+        cov = np.where(both, (x - xm) * (y - ym), 0.0).sum(axis=0) / (n - 1)
+        var = np.where(both, (y - ym) ** 2, 0.0).sum(axis=0) / (n - 1)
+        values = cov / var
+    return pd.Series(np.where(n > 2, values, np.nan), index=returns.columns)
+
+
+def correlation_matrix(returns, window=CORRELATION_WINDOW):
+    """최근 window봉 종목 간 상관계수 행렬 (매일 실행하면 이동 상관계수)"""
+    return returns.iloc[-window:].corr(min_periods=window // 2)
+
+
+def average_correlation(matrix, sectors):
+    """상관계수 행렬 → 섹터별 종목 간 평균 상관계수 (종목 1개 섹터는 NaN)"""
+    values = matrix.to_numpy().copy()
+    np.fill_diagonal(values, np.nan)
+    groups = pd.Series(sectors).reindex(matrix.index)
+    result = {}
+    for sector, members in groups.groupby(groups, sort=False).groups.items():
+        idx = matrix.index.get_indexer(members)
+        block = values[np.ix_(idx, idx)]
+        result[sector] = np.nanmean(block) if np.isfinite(block).any() else np.nan
+    return pd.Series(result)
+
+
+# ============================================================================
+# SUMMARY
+# ============================================================================
+
+def sector_analytics(close, sectors, benchmark=None, weights=None):
+    """
+    섹터 분석 → dict
+    - summary: 섹터별 종목 수, 1일/1개월 수익률, 변동성, 최대 낙폭, 베타, 평균 상관계수
+    - stocks: 종목별 변동성, 최대 낙폭, 베타
+    - indices: (날짜 x 섹터) 섹터 지수
+    - correlation: 최근 CORRELATION_WINDOW 종목 간 상관계수 행렬
+    """
+    close = close[[ticker for ticker in close.columns if ticker in sectors]]
+    sectors = {ticker: sectors[ticker] for ticker in close.columns}
+    returns = daily_returns(close)
+    combined = sector_returns(returns, sectors, weights)
+    levels = index_levels(combined)
+    bench = daily_returns(benchmark.to_frame()).iloc[:, 0] if benchmark is not None else None
+
+    correlation = correlation_matrix(returns)
+    with warnings.catch_warnings():
+        # 섹터 종목이 모두 거래 없는 날 (NaN)
+        warnings.simplefilter('ignore', RuntimeWarning)
+        summary = pd.DataFrame({
+            'stocks': pd.Series(sectors).value_counts(),
+            'return_1d': combined.ffill().iloc[-1] * 100,
+            'return_1m': (levels.iloc[-1] / levels.iloc[-MONTH_BARS - 1] - 1) * 100
+            if len(levels) > MONTH_BARS else np.nan,
+            'volatility': rolling_volatility(combined).iloc[-1],
+            'max_drawdown': max_drawdown(levels),
+            'beta': beta(combined, bench) if bench is not None else np.nan,
+            'avg_correlation': average_correlation(correlation, sectors),
+        }).reindex(combined.columns)
+
+        stocks = pd.DataFrame({
+            'sector': pd.Series(sectors).reindex(close.columns),
+            'volatility': rolling_volatility(returns).iloc[-1],
+            'max_drawdown': max_drawdown(close.ffill()),
+            'beta': beta(returns, bench) if bench is not None else np.nan,
+        })
+
+    summary.index.name = 'sector'
+    stocks.index.name = 'ticker'
+    return {'summary': summary, 'stocks': stocks, 'indices': levels, 'correlation': correlation}
+
+
+def load_sector_analytics(stocks, period='1y', benchmark=BENCHMARK, weighting=SECTOR_WEIGHTING):
+    """
+    STOCKS 형식 목록 → sector_analytics 결과
+    - 일봉은 캐시에서 (이미 갱신한 종목은 다시 받지 않음), 벤치마크는 함께 갱신
+    """
+    sectors = {stock['ticker']: stock['sector'] for stock in stocks}
+    panel, _ = load_history(list(sectors) + [benchmark], period=period)
+    if panel.empty:
+        return None
+
+    close = panel['Close']
+    bench = close[benchmark] if benchmark in close.columns else None
+    close = close[[ticker for ticker in sectors if ticker in close.columns]]
+    weights = cap_weights(list(close.columns), sectors) if weighting == 'cap' else None
+    return sector_analytics(close, sectors, bench, weights)
@@ -0,0 +1,108 @@
+"""
+Seen news link store (SQLite)
+- 링크별 최초 수집 시각 기록, 보관 기간(7일) 지난 링크 자동 삭제
+- PRIMARY KEY 인덱스로 조회 → 전체를 메모리에 올리지 않음
+- 이번 실행에서 새로 본 링크만 INSERT
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+NEWS_HISTORY_DB = os.environ.get('NEWS_HISTORY_DB', 'news_history.db')
+LEGACY_HISTORY_FILE = 'news_history.json'
+
+# 수집기가 7일 이내 기사만 받으므로 그보다 오래된 링크는 다시 나올 일이 없음
+RETENTION_DAYS = 7
+
+
+# ============================================================================
+# STORE
+# ============================================================================
+
+class SeenLinkStore:
+    """Set-like store of seen links: `in`, add(), len(), flush()"""
+
+    def __init__(self, path=NEWS_HISTORY_DB, retention_days=RETENTION_DAYS):
+        self.path = path
+        self.retention_days = retention_days
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_links ("
+            " link TEXT PRIMARY KEY,"
+            " first_seen REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_seen_links_first_seen ON seen_links(first_seen)"
+        )
+        self.conn.commit()
+        # 이번 실행에서 새로 본 링크 (flush 전까지 메모리에만 보관)
+        self.pending = {}
+
+    def __contains__(self, link):
+        if link in self.pending:
+            return True
+        row = self.conn.execute("SELECT 1 FROM seen_links WHERE link = ?", (link,)).fetchone()
+        return row is not None
+
+    def __len__(self):
+        stored = self.conn.execute("SELECT COUNT(*) FROM seen_links").fetchone()[0]
+        return stored + len(self.pending)
+
+    def add(self, link):
+        if link not in self:
+            self.pending[link] = time.time()
+
+    def evict_expired(self):
+        """Delete links first seen before the retention window, return count"""
+        cutoff = time.time() - self.retention_days * 86400
+        cursor = self.conn.execute("DELETE FROM seen_links WHERE first_seen < ?", (cutoff,))
+        self.conn.commit()
+        return cursor.rowcount
+
+    def import_legacy_json(self, path=LEGACY_HISTORY_FILE):
+        """One-time import of the old news_history.json list (only into an empty store)"""
+        if not os.path.exists(path):
+            return 0
+        if self.conn.execute("SELECT 1 FROM seen_links LIMIT 1").fetchone():
+            return 0
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                links = json.load(f).get('seen_links', [])
+        except (OSError, ValueError):
+            return 0
+
+        # 최초 수집 시각을 알 수 없으므로 지금 기준으로 보관 기간 시작
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO seen_links (link, first_seen) VALUES (?, ?)",
+            ((link, now) for link in links)
+        )
+        self.conn.commit()
+        return len(links)
+
+    def flush(self):
+        """Write links added in this run, return count"""
+        if not self.pending:
+            return 0
+
+        count = len(self.pending)
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO seen_links (link, first_seen) VALUES (?, ?)",
+            self.pending.items()
+        )
+        self.conn.commit()
+        self.pending = {}
+        return count
+
+    def close(self):
+        self.flush()
+        self.conn.close()
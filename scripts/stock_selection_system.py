@@ -4,147 +4,28 @@
 - 시가총액, 거래량, 수익률, 모멘텀 등을 종합 평가
 """
 
-import yfinance as yf
 import pandas as pd
-from datetime import datetime, timedelta
+import os
+import time
+from collections import Counter
+from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+from candidate_pools import CANDIDATE_POOLS, SECTOR_MAPPING
+from exporter import EXPORT_EXCEL, write_excel, write_table
+from fundamentals import get_market_cap
+from indicators import compute_from_history
+from market_data import get_history, print_fetch_stats
+from scoring import selection_score
+from screening import screen_candidates
+from universe_snapshot import write_snapshot
+
 print("="*80)
 print("🔍 데이터센터 종목 자동 선정 시스템 v1.0")
 print("="*80 + "\n")
 
-# 각 세부영역별 후보 종목 Pool
-CANDIDATE_POOLS = {
-    # AI 인프라 - GPU
-    'GPU': [
-        {'name': 'NVIDIA', 'ticker': 'NVDA', 'exchange': 'US'},
-        {'name': 'AMD', 'ticker': 'AMD', 'exchange': 'US'},
-    ],
-    
-    # AI 인프라 - CPU
-    'CPU': [
-        {'name': 'Intel', 'ticker': 'INTC', 'exchange': 'US'},
-        {'name': 'AMD', 'ticker': 'AMD', 'exchange': 'US'},
-    ],
-    
-    # AI 인프라 - 서버제조
-    '서버제조': [
-        {'name': 'Super Micro', 'ticker': 'SMCI', 'exchange': 'US'},
-        {'name': 'Dell', 'ticker': 'DELL', 'exchange': 'US'},
-        {'name': 'HPE', 'ticker': 'HPE', 'exchange': 'US'},
-        {'name': 'Lenovo', 'ticker': '0992.HK', 'exchange': 'HK'},
-    ],
-    
-    # 전력/쿨링 - 전력관리
-    '전력관리': [
-        {'name': 'Vertiv', 'ticker': 'VRT', 'exchange': 'US'},
-        {'name': 'Eaton', 'ticker': 'ETN', 'exchange': 'US'},
-        {'name': 'Schneider Electric', 'ticker': 'SU.PA', 'exchange': 'EU'},
-    ],
-    
-    # 전력/쿨링 - 전력기기
-    '전력기기': [
-        {'name': 'LS ELECTRIC', 'ticker': '010120.KS', 'exchange': 'KR'},
-        {'name': 'LS', 'ticker': '006260.KS', 'exchange': 'KR'},
-    ],
-    
-    # 전력/쿨링 - 발전기
-    '발전기': [
-        {'name': 'Cummins', 'ticker': 'CMI', 'exchange': 'US'},
-        {'name': 'Generac', 'ticker': 'GNRC', 'exchange': 'US'},
-        {'name': 'Caterpillar', 'ticker': 'CAT', 'exchange': 'US'},
-    ],
-    
-    # 전력/쿨링 - HVAC
-    'HVAC': [
-        {'name': 'Johnson Controls', 'ticker': 'JCI', 'exchange': 'US'},
-        {'name': 'Trane Tech', 'ticker': 'TT', 'exchange': 'US'},
-        {'name': 'Carrier Global', 'ticker': 'CARR', 'exchange': 'US'},
-    ],
-    
-    # 네트워크 - 스위치
-    '스위치': [
-        {'name': 'Arista Networks', 'ticker': 'ANET', 'exchange': 'US'},
-        {'name': 'Cisco', 'ticker': 'CSCO', 'exchange': 'US'},
-        {'name': 'Juniper', 'ticker': 'JNPR', 'exchange': 'US'},
-    ],
-    
-    # 네트워크 - 네트워크칩
-    '네트워크칩': [
-        {'name': 'Broadcom', 'ticker': 'AVGO', 'exchange': 'US'},
-        {'name': 'Marvell', 'ticker': 'MRVL', 'exchange': 'US'},
-        {'name': 'Microchip', 'ticker': 'MCHP', 'exchange': 'US'},
-    ],
-    
-    # 네트워크 - 광트랜시버
-    '광트랜시버': [
-        {'name': 'HFR', 'ticker': '230240.KQ', 'exchange': 'KR'},
-        {'name': '옵트론텍', 'ticker': '082210.KQ', 'exchange': 'KR'},
-    ],
-    
-    # 네트워크 - 광섬유케이블
-    '광섬유케이블': [
-        {'name': 'Corning', 'ticker': 'GLW', 'exchange': 'US'},
-        {'name': 'Prysmian', 'ticker': 'PRY.MI', 'exchange': 'EU'},
-    ],
-    
-    # 네트워크 - 광학부품
-    '광학부품': [
-        {'name': 'Lumentum', 'ticker': 'LITE', 'exchange': 'US'},
-        {'name': 'II-VI', 'ticker': 'COHR', 'exchange': 'US'},
-    ],
-    
-    # 메모리/스토리지 - HBM메모리
-    'HBM메모리': [
-        {'name': 'SK hynix', 'ticker': '000660.KS', 'exchange': 'KR'},
-        {'name': 'Samsung', 'ticker': '005930.KS', 'exchange': 'KR'},
-        {'name': 'Micron', 'ticker': 'MU', 'exchange': 'US'},
-    ],
-    
-    # 메모리/스토리지 - 반도체패키징
-    '반도체패키징': [
-        {'name': '한미반도체', 'ticker': '042700.KQ', 'exchange': 'KR'},
-        {'name': 'Amkor', 'ticker': 'AMKR', 'exchange': 'US'},
-        {'name': 'ASE Technology', 'ticker': '3711.TW', 'exchange': 'TW'},
-    ],
-    
-    # 메모리/스토리지 - 스토리지
-    '스토리지': [
-        {'name': 'Western Digital', 'ticker': 'WDC', 'exchange': 'US'},
-        {'name': 'Seagate', 'ticker': 'STX', 'exchange': 'US'},
-        {'name': 'NetApp', 'ticker': 'NTAP', 'exchange': 'US'},
-    ],
-    
-    # DC 부동산 - 데이터센터REIT
-    '데이터센터REIT': [
-        {'name': 'Digital Realty', 'ticker': 'DLR', 'exchange': 'US'},
-        {'name': 'Equinix', 'ticker': 'EQIX', 'exchange': 'US'},
-        {'name': 'CyrusOne', 'ticker': 'CONE', 'exchange': 'US'},
-    ],
-}
-
-# 세부영역과 대분류/중분류 매핑
-SECTOR_MAPPING = {
-    'GPU': {'category': 'AI 인프라', 'sector': 'AI칩'},
-    'CPU': {'category': 'AI 인프라', 'sector': 'AI칩'},
-    '서버제조': {'category': 'AI 인프라', 'sector': 'AI서버'},
-    '전력관리': {'category': '전력/쿨링', 'sector': '전력'},
-    '전력기기': {'category': '전력/쿨링', 'sector': '전력'},
-    '발전기': {'category': '전력/쿨링', 'sector': '발전'},
-    'HVAC': {'category': '전력/쿨링', 'sector': '쿨링'},
-    '스위치': {'category': '네트워크', 'sector': '네트워크'},
-    '네트워크칩': {'category': '네트워크', 'sector': '네트워크'},
-    '광트랜시버': {'category': '네트워크', 'sector': '광통신'},
-    '광섬유케이블': {'category': '네트워크', 'sector': '광섬유'},
-    '광학부품': {'category': '네트워크', 'sector': '광통신'},
-    'HBM메모리': {'category': '메모리/스토리지', 'sector': 'HBM'},
-    '반도체패키징': {'category': '메모리/스토리지', 'sector': '패키징'},
-    '스토리지': {'category': '메모리/스토리지', 'sector': 'SSD'},
-    '데이터센터REIT': {'category': 'DC 부동산', 'sector': 'DC REIT'},
-}
-
-def calculate_selection_score(ticker, name, exchange):
+def calculate_selection_score(ticker, name, exchange, hist=None, row=None, market_cap=None):
     """
     종목 선정 점수 계산 (100점 만점)
     - 시가총액: 30점
@@ -152,110 +33,37 @@ def calculate_selection_score(ticker, name, exchange):
     - 3개월 수익률: 20점
     - 6개월 수익률: 15점
     - 기술적 지표: 15점
+    row(indicators.compute_indicators 결과 1행)가 있으면 지표 계산 생략,
+    hist가 있으면 가격 데이터 다운로드 생략,
+    market_cap(달러 환산)이 있으면 기본 정보 조회 생략
     """
     try:
-        stock = yf.Ticker(ticker)
-        
-        # 기본 정보
-        info = stock.info
-        market_cap = info.get('marketCap', 0)
-        
-        # 가격 데이터
-        hist = stock.history(period="1y")
-        if hist.empty or len(hist) < 126:
+        # 가격 지표
+        if row is None:
+            if hist is None:
+                hist = get_history(ticker, period="1y")
+            row = compute_from_history(hist) if hist is not None and not hist.empty else None
+        if row is None or row['bars'] < 126:
             print(f"  ⚠️ {name}: 데이터 부족")
             return None
         
-        current = hist['Close'].iloc[-1]
+        # 기본 정보 (fundamentals 캐시, 달러 환산)
+        if market_cap is None:
+            market_cap = get_market_cap(ticker, row['price'])
         
-        # 수익률
-        return_3m = ((current / hist['Close'].iloc[-63]) - 1) * 100 if len(hist) >= 63 else 0
-        return_6m = ((current / hist['Close'].iloc[-126]) - 1) * 100 if len(hist) >= 126 else 0
+        current = row['price']
+        return_3m = row['return_3m']
+        return_6m = row['return_6m']
+        volume_trend = row['volume_trend']
+        ma_20 = row['ma_20']
+        golden_cross = bool(row['golden_cross'])
+        rsi_value = row['rsi']
         
-        # 거래량
-        avg_volume_20 = hist['Volume'].rolling(20).mean().iloc[-1]
-        avg_volume_60 = hist['Volume'].rolling(60).mean().iloc[-1]
-        volume_trend = (avg_volume_20 / avg_volume_60) if avg_volume_60 > 0 else 1
-        
-        # 이동평균
-        ma_20 = hist['Close'].rolling(20).mean().iloc[-1]
-        ma_60 = hist['Close'].rolling(60).mean().iloc[-1]
-        golden_cross = ma_20 > ma_60
-        
-        # RSI
-        delta = hist['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        rsi_value = rsi.iloc[-1]
-        
-        # 점수 계산
-        score = 0
-        
-        # 1. 시가총액 점수 (30점)
-        if market_cap >= 100_000_000_000:  # 1000억 달러 이상
-            score += 30
-        elif market_cap >= 50_000_000_000:  # 500억 달러 이상
-            score += 25
-        elif market_cap >= 10_000_000_000:  # 100억 달러 이상
-            score += 20
-        elif market_cap >= 5_000_000_000:   # 50억 달러 이상
-            score += 15
-        elif market_cap >= 1_000_000_000:   # 10억 달러 이상
-            score += 10
-        else:
-            score += 5
-        
-        # 2. 거래량 점수 (20점)
-        if volume_trend >= 1.5:  # 최근 거래량 급증
-            score += 20
-        elif volume_trend >= 1.2:
-            score += 15
-        elif volume_trend >= 1.0:
-            score += 10
-        else:
-            score += 5
-        
-        # 3. 3개월 수익률 점수 (20점)
-        if return_3m >= 30:
-            score += 20
-        elif return_3m >= 20:
-            score += 17
-        elif return_3m >= 10:
-            score += 14
-        elif return_3m >= 0:
-            score += 10
-        elif return_3m >= -10:
-            score += 5
-        # 마이너스 크면 0점
-        
-        # 4. 6개월 수익률 점수 (15점)
-        if return_6m >= 40:
-            score += 15
-        elif return_6m >= 25:
-            score += 12
-        elif return_6m >= 10:
-            score += 9
-        elif return_6m >= 0:
-            score += 6
-        elif return_6m >= -15:
-            score += 3
-        
-        # 5. 기술적 지표 점수 (15점)
-        tech_score = 0
-        if golden_cross:
-            tech_score += 6
-        if 40 <= rsi_value <= 60:  # 중립구간 (좋음)
-            tech_score += 6
-        elif 30 <= rsi_value <= 70:
-            tech_score += 3
-        
-        price_vs_ma20 = (current / ma_20 - 1) * 100
-        if price_vs_ma20 > 0:  # 20일선 위
-            tech_score += 3
-        
-        score += tech_score
+        # 점수 계산 (배점표: scoring.py)
+        score = float(selection_score(
+            market_cap, volume_trend, return_3m, return_6m,
+            golden_cross, rsi_value, (current / ma_20 - 1) * 100
+        ))
         
         return {
             'name': name,
@@ -279,24 +87,37 @@ def select_best_stocks_per_sector():
     
     selected_stocks = []
     
+    # 싼 필터부터 적용해 점수 계산 대상 축소 (가격/기본 정보는 여기서 일괄 조회)
+    screened = screen_candidates(CANDIDATE_POOLS)
+    indicators = screened['indicators']
+    fundamentals = screened['fundamentals']
+    survivors = screened['survivors']
+    report = screened['report']
+    
+    # 통과한 후보만 점수 계산 (네트워크 조회는 스크리닝에서 끝남 → 메모리 계산만)
+    scoring_start = time.perf_counter()
+    scored = set()
+    
     for sub_sector, candidates in CANDIDATE_POOLS.items():
+        passed = [candidate for candidate in candidates if candidate['ticker'] in survivors]
         print(f"\n{'='*60}")
         print(f"📂 세부영역: {sub_sector}")
-        print(f"   후보: {len(candidates)}개")
+        print(f"   후보: {len(candidates)}개 (스크리닝 통과 {len(passed)}개)")
         print(f"{'='*60}")
         
         sector_results = []
         
-        for candidate in candidates:
+        for candidate in passed:
             print(f"  분석 중: {candidate['name']:20s} ... ", end='')
             result = calculate_selection_score(
-                candidate['ticker'],
-                candidate['name'],
-                candidate['exchange']
+                candidate['ticker'], candidate['name'], candidate['exchange'],
+                row=indicators.loc[candidate['ticker']],
+                market_cap=fundamentals.get(candidate['ticker'], {}).get('market_cap_usd') or 0
             )
             
             if result:
                 sector_results.append(result)
+                scored.add(candidate['ticker'])
                 print(f"✅ {result['score']:.1f}점")
             else:
                 print("❌")
@@ -326,7 +147,14 @@ def select_best_stocks_per_sector():
                 second = sector_results[1]
                 print(f"  2위: {second['name']} ({second['score']:.1f}점)")
         else:
-            print(f"  ⚠️ 해당 세부영역에서 선정 가능한 종목 없음")
+            print("  ⚠️ 해당 세부영역에서 선정 가능한 종목 없음")
+    
+    report.record('점수 계산', len(survivors), len(scored), time.perf_counter() - scoring_start)
+    report.print()
+    
+    reasons = Counter(screened['eliminated'].values())
+    if reasons:
+        print("  탈락 사유: " + ", ".join(f"{reason} {count}개" for reason, count in reasons.most_common()))
     
     return selected_stocks
 
@@ -335,6 +163,9 @@ print("\n🚀 종목 선정 프로세스 시작...\n")
 
 selected = select_best_stocks_per_sector()
 
+print()
+print_fetch_stats()
+
 print(f"\n{'='*80}")
 print(f"✅ 총 {len(selected)}개 종목 선정 완료!")
 print(f"{'='*80}\n")
@@ -342,15 +173,16 @@ print(f"{'='*80}\n")
 # DataFrame으로 변환
 df_selected = pd.DataFrame(selected)
 
-# 결과를 Excel로 저장
+# 선정 결과 저장 (Parquet/CSV, Excel은 EXPORT_EXCEL=1일 때만)
 now = datetime.now()
 date_str = now.strftime('%Y%m%d')
 # GitHub Actions 및 로컬 실행 모두 호환되는 경로
 output_dir = 'outputs'
 os.makedirs(output_dir, exist_ok=True)
-excel_file = f'{output_dir}/selected_stocks_{date_str}.xlsx'
+result_file = write_table(df_selected, f'{output_dir}/selected_stocks_{date_str}')
+print(f"📊 결과 파일 저장: {result_file}")
 
-with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
+if EXPORT_EXCEL:
     # 1. 선정 결과
     df_export = df_selected[[
         'name', 'ticker', 'category', 'sector', 'sub_sector',
@@ -364,9 +196,7 @@ with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
         '종합점수', '시가총액(B$)', '3개월수익률(%)', '6개월수익률(%)',
         '골든크로스', 'RSI'
     ]
-    
     df_export = df_export.round(2)
-    df_export.to_excel(writer, sheet_name='선정결과', index=False)
     
     # 2. 대분류별 통계
     category_stats = df_selected.groupby('category').agg({
@@ -375,14 +205,12 @@ with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
         'name': 'count'
     }).round(2)
     category_stats.columns = ['평균점수', '평균3개월수익률', '종목수']
-    category_stats.to_excel(writer, sheet_name='대분류별통계')
     
     # 3. 점수 상위 종목
     top_scores = df_selected.nlargest(10, 'score')[[
         'name', 'category', 'sub_sector', 'score', 'return_3m'
     ]].copy()
     top_scores.columns = ['종목명', '대분류', '세부분류', '점수', '3개월수익률']
-    top_scores.to_excel(writer, sheet_name='점수TOP10', index=False)
     
     # 4. 선정 기준 설명
     criteria_df = pd.DataFrame({
@@ -396,13 +224,22 @@ with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
             '골든크로스, RSI 중립구간, 20일선 상향'
         ]
     })
-    criteria_df.to_excel(writer, sheet_name='선정기준', index=False)
+    
+    excel_file = write_excel(f'{output_dir}/selected_stocks_{date_str}.xlsx', {
+        '선정결과': (df_export, False),
+        '대분류별통계': (category_stats, True),
+        '점수TOP10': (top_scores, False),
+        '선정기준': (criteria_df, False),
+    })
+    print(f"📊 Excel 파일 저장: {excel_file}")
 
-print(f"📊 결과 파일 저장: {excel_file}")
+# 일일 리포트가 시작할 때 읽는 종목 스냅샷 (선정 결과 + 1년치 일봉 + 지표 상태)
+snapshot_file = write_snapshot(selected)
+print(f"🗂️ 종목 스냅샷 저장: {snapshot_file} (일일 리포트가 자동으로 사용)")
 
-# Python 코드 생성 (main 스크립트에 복붙용)
+# 선정 결과 목록 (참고용)
 print("\n" + "="*80)
-print("📝 아래 코드를 main 스크립트의 STOCKS 변수에 복사하세요:")
+print("📝 선정 종목 목록 (일일 리포트는 스냅샷에서 자동 로드):")
 print("="*80 + "\n")
 
 print("STOCKS = [")
@@ -0,0 +1,171 @@
+"""
+Telegram delivery queue
+- 텍스트 메시지는 순서 보장 레인(1개 워커), 문서는 별도 레인에서 병렬 전송
+- 전역 속도 제한: rate_limit.HOST_RATE_LIMITS['api.telegram.org']
+- 채팅방별 속도 제한: 채팅 ID별 token bucket
+- 429 응답의 parameters.retry_after 만큼 대기 후 재시도, 5xx/네트워크 오류는 지수 백오프
+- 메시지별 상태/시도 횟수/지연 시간 보고
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import http_client
+from rate_limit import TokenBucket
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+TELEGRAM_API_URL = "https://api.telegram.org/bot{token}/{method}"
+
+# 같은 채팅방에는 초당 1건 정도가 안전 (버스트 3)
+PER_CHAT_RATE = (1.0, 3)
+
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 1.0
+MESSAGE_TIMEOUT = 10
+DOCUMENT_TIMEOUT = 60
+
+
+# ============================================================================
+# DELIVERY
+# ============================================================================
+
+_chat_buckets = {}
+_chat_buckets_lock = threading.Lock()
+_session = None
+_session_lock = threading.Lock()
+
+
+def _chat_bucket(chat_id):
+    with _chat_buckets_lock:
+        bucket = _chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = TokenBucket(*PER_CHAT_RATE)
+            _chat_buckets[chat_id] = bucket
+        return bucket
+
+
+def _get_session():
+    """Pooled session without status retries (429/5xx are handled here)"""
+    global _session
+    if _session is None:
+        # 메시지/문서 레인이 동시에 처음 호출해도 한 번만 생성
+        with _session_lock:
+            if _session is None:
+                _session = http_client.create_session(retries=0)
+    return _session
+
+
+def deliver(token, chat_id, method, data, file_path=None, file_field='document',
+            timeout=MESSAGE_TIMEOUT):
+    """
+    Call a Telegram Bot API method with rate limiting and retries
+    반환: {'method', 'ok', 'status', 'attempts', 'latency', 'error'}
+    """
+    url = TELEGRAM_API_URL.format(token=token, method=method)
+    data = dict(data, chat_id=chat_id)
+    result = {'method': method, 'ok': False, 'status': None, 'attempts': 0,
+              'latency': 0.0, 'error': ''}
+    start = time.perf_counter()
+
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        result['attempts'] = attempt
+        _chat_bucket(chat_id).acquire()
+        delay = BACKOFF_BASE * 2 ** (attempt - 1)
+
+        try:
+            if file_path:
+                with open(file_path, 'rb') as f:
+                    response = http_client.post(url, data=data, files={file_field: f},
+                                                timeout=timeout, session=_get_session())
+            else:
+                response = http_client.post(url, data=data, timeout=timeout, session=_get_session())
+        except (requests.RequestException, OSError) as e:
+            result['error'] = str(e)[:100]
+        else:
+            result['status'] = response.status_code
+
+            if response.status_code == 200:
+                result['ok'] = True
+                result['error'] = ''
+                break
+
+            try:
+                body = response.json()
+            except ValueError:
+                body = {}
+            result['error'] = body.get('description', '')[:100]
+
+            if response.status_code == 429:
+                # 텔레그램이 알려준 대기 시간 우선
+                delay = body.get('parameters', {}).get('retry_after', delay)
+            elif response.status_code < 500:
+                # 400/401/403 등은 재시도해도 같은 결과
+                break
+
+        if attempt < MAX_ATTEMPTS:
+            time.sleep(delay)
+
+    result['latency'] = time.perf_counter() - start
+    return result
+
+
+class TelegramDelivery:
+    """Queue messages and documents, send them in the background, report results"""
+
+    def __init__(self, token, chat_id):
+        self.token = token
+        self.chat_id = chat_id
+        # 텍스트는 순서대로, 문서는 텍스트와 병렬로
+        self.message_lane = ThreadPoolExecutor(max_workers=1)
+        self.document_lane = ThreadPoolExecutor(max_workers=1)
+        self.jobs = []
+        self.queued = 0
+
+    def send_message(self, text, label=None):
+        future = self.message_lane.submit(
+            deliver, self.token, self.chat_id, 'sendMessage', {'text': text}
+        )
+        self.queued += 1
+        self.jobs.append((label or f"Message {self.queued}", future))
+        return future
+
+    def send_document(self, file_path, caption='', label=None):
+        future = self.document_lane.submit(
+            deliver, self.token, self.chat_id, 'sendDocument', {'caption': caption},
+            file_path, 'document', DOCUMENT_TIMEOUT
+        )
+        self.queued += 1
+        self.jobs.append((label or file_path, future))
+        return future
+
+    def collect(self):
+        """Drop items that are already sent, return their [(label, result)] in queue order"""
+        # 오래 도는 감시 모드에서 jobs가 계속 늘지 않도록 완료된 항목은 꺼냄
+        pending, results = [], []
+        for label, future in self.jobs:
+            if future.done():
+                results.append((label, future.result()))
+            else:
+                pending.append((label, future))
+        self.jobs = pending
+        return results
+
+    def wait(self):
+        """Block until every queued item is sent, return [(label, result)] in queue order"""
+        results = [(label, future.result()) for label, future in self.jobs]
+        self.message_lane.shutdown()
+        self.document_lane.shutdown()
+        return results
+
+    @staticmethod
+    def print_report(results):
+        for label, result in results:
+            status = 'Sent' if result['ok'] else f"FAILED ({result['status'] or result['error']})"
+            print(f"  {label}: {status} | {result['latency']:.2f}s, {result['attempts']} attempt(s)")
@@ -0,0 +1,121 @@
+"""
+Translation cache (SQLite)
+- 키: sha256(원문, source, target, 최대 길이)
+- TTL 지난 항목 삭제 + 최대 개수 초과 시 오래 안 쓴 항목부터 삭제 (LRU)
+- 실행 중 조회는 메모리 캐시로 바로 응답, hit/miss 카운터 제공
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+TRANSLATION_CACHE_DB = os.environ.get('TRANSLATION_CACHE_DB', 'translation_cache.db')
+TRANSLATION_CACHE_TTL_DAYS = 30
+TRANSLATION_CACHE_MAX_ENTRIES = 20000
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+def make_key(text, source, target, max_length):
+    raw = '\x00'.join([source, target, str(max_length), text])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class TranslationCache:
+    """On-disk translation cache with TTL/LRU eviction and hit/miss counters"""
+
+    def __init__(self, path=TRANSLATION_CACHE_DB, ttl_days=TRANSLATION_CACHE_TTL_DAYS,
+                 max_entries=TRANSLATION_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.memory = {}
+        # 조회된 키의 마지막 사용 시각 (close 시 한 번에 기록)
+        self.touched = {}
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " key TEXT PRIMARY KEY,"
+            " translated TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " last_used REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used)"
+        )
+        self.conn.execute("DELETE FROM translations WHERE created < ?", (time.time() - self.ttl,))
+        self.conn.commit()
+
+    def get(self, text, source, target, max_length):
+        """Return the cached translation or None"""
+        key = make_key(text, source, target, max_length)
+
+        with self.lock:
+            translated = self.memory.get(key)
+            if translated is None:
+                row = self.conn.execute(
+                    "SELECT translated, created FROM translations WHERE key = ?", (key,)
+                ).fetchone()
+                if row and row[1] >= time.time() - self.ttl:
+                    translated = row[0]
+                    self.memory[key] = translated
+
+            if translated is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.touched[key] = time.time()
+            return translated
+
+    def set(self, text, source, target, max_length, translated):
+        key = make_key(text, source, target, max_length)
+        now = time.time()
+
+        with self.lock:
+            self.memory[key] = translated
+            self.conn.execute(
+                "INSERT OR REPLACE INTO translations (key, translated, created, last_used)"
+                " VALUES (?, ?, ?, ?)",
+                (key, translated, now, now)
+            )
+            self.conn.commit()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / total * 100) if total else 0,
+        }
+
+    def close(self):
+        """Record last-used times, trim to max_entries (LRU) and close"""
+        with self.lock:
+            self.conn.executemany(
+                "UPDATE translations SET last_used = ? WHERE key = ?",
+                ((used, key) for key, used in self.touched.items())
+            )
+            self.conn.execute(
+                "DELETE FROM translations WHERE key IN ("
+                " SELECT key FROM translations ORDER BY last_used DESC LIMIT -1 OFFSET ?"
+                ")",
+                (self.max_entries,)
+            )
+            self.conn.commit()
+            self.conn.close()
+            self.touched = {}
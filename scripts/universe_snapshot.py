@@ -0,0 +1,179 @@
+"""
+Universe snapshot (월간 종목 선정 → 일일 리포트)
+- 종목 선정 결과, 세부영역 정보, 종목별 1년치 일봉, 지표 상태를 버전 있는 JSON 파일로 저장
+- 일일 리포트는 시작할 때 읽어서 종목 목록으로 쓰고, 비어 있는 OHLCV 캐시를 미리 채움
+  (선정 직후 첫 실행도 새로 생긴 봉만 다운로드)
+"""
+
+import json
+import math
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from candidate_pools import DATA_DIR
+from indicator_state import sync_states
+from ohlcv_cache import PERIOD_DAYS, OHLCVCache
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SNAPSHOT_VERSION = 1
+
+SNAPSHOT_FILE = os.environ.get('UNIVERSE_SNAPSHOT', os.path.join(DATA_DIR, 'universe_snapshot.json'))
+
+# 저장할 일봉 기간 (일일 리포트가 요청하는 기간과 동일)
+SNAPSHOT_PERIOD = '1y'
+
+STOCK_FIELDS = ['name', 'ticker', 'category', 'sector', 'sub_sector', 'score']
+
+_HISTORY_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+# ============================================================================
+# WRITE
+# ============================================================================
+
+def _clean(value):
+    """JSON에 넣을 수 있는 값 (NaN → None, numpy 스칼라 → 파이썬 값)"""
+    if value is None:
+        return None
+    value = value.item() if hasattr(value, 'item') else value
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def unique_stocks(stocks):
+    """
+    티커당 1개 (여러 세부영역에서 선정된 종목은 점수가 가장 높은 항목, 같으면 먼저 나온 항목)
+    - 원래 순서 유지
+    """
+    best = {}
+    for index, stock in enumerate(stocks):
+        kept = best.get(stock['ticker'])
+        if kept is None or (stock.get('score') or 0) > (stocks[kept].get('score') or 0):
+            best[stock['ticker']] = index
+    return [stocks[index] for index in sorted(best.values())]
+
+
+def build_snapshot(stocks, cache, period=SNAPSHOT_PERIOD):
+    """선정 종목 목록 + 캐시 일봉/지표 상태 → snapshot dict"""
+    stocks = unique_stocks(stocks)
+    tickers = [stock['ticker'] for stock in stocks]
+    covered_from = (datetime.now() - timedelta(days=PERIOD_DAYS[period])).strftime('%Y-%m-%d')
+
+    panel = cache.read(tickers, covered_from)
+    history = {}
+    for ticker in tickers:
+        if panel.empty or ('Close', ticker) not in panel.columns:
+            continue
+        hist = panel.xs(ticker, axis=1, level='ticker').dropna(subset=['Close'])
+        history[ticker] = {
+            'dates': [date.strftime('%Y-%m-%d') for date in hist.index],
+            **{field.lower(): [_clean(v) for v in hist[field]] for field in _HISTORY_FIELDS},
+        }
+
+    states, _ = sync_states(list(history), cache)
+
+    return {
+        'version': SNAPSHOT_VERSION,
+        'created': datetime.now().strftime('%Y-%m-%d %H:%M'),
+        'period': period,
+        'covered_from': covered_from,
+        'stocks': [{field: _clean(stock.get(field)) for field in STOCK_FIELDS} for stock in stocks],
+        'history': history,
+        'indicator_state': {ticker: json.loads(state.to_json()) for ticker, state in states.items()},
+    }
+
+
+def write_snapshot(stocks, path=SNAPSHOT_FILE, cache=None):
+    """snapshot 파일 저장 → 경로"""
+    own_cache = cache is None
+    cache = cache or OHLCVCache()
+    snapshot = build_snapshot(stocks, cache)
+    if own_cache:
+        cache.close()
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+    return path
+
+
+# ============================================================================
+# READ
+# ============================================================================
+
+def load_snapshot(path=SNAPSHOT_FILE):
+    """snapshot dict, 파일이 없거나 버전이 다르면 None"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ 종목 스냅샷 읽기 실패: {str(e)[:100]}")
+        return None
+
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        print(f"⚠️ 종목 스냅샷 버전 불일치 ({snapshot.get('version')} != {SNAPSHOT_VERSION}), 무시")
+        return None
+    return snapshot
+
+
+def snapshot_stocks(snapshot):
+    """일일 리포트 STOCKS 형식 [{'name', 'ticker', 'sector'}] (티커 중복 제거)"""
+    return [{'name': stock['name'], 'ticker': stock['ticker'], 'sector': stock['sector']}
+            for stock in unique_stocks(snapshot['stocks'])]
+
+
+def _history_frame(data):
+    return pd.DataFrame({field: data[field.lower()] for field in _HISTORY_FIELDS},
+                        index=pd.to_datetime(data['dates']), dtype=float)
+
+
+def warm_start(snapshot, cache=None):
+    """
+    snapshot 일봉/지표 상태로 OHLCV 캐시 채우기 → {'seeded', 'appended', 'states'}
+    - 캐시에 없거나 기간이 모자란 종목: snapshot 일봉으로 교체
+    - 캐시가 snapshot보다 오래된 종목: 뒤쪽 봉만 추가
+    - 지표 상태가 없는 종목: snapshot 상태 저장 (캐시 마지막 봉과 날짜가 같을 때만)
+    """
+    own_cache = cache is None
+    cache = cache or OHLCVCache()
+    history = snapshot.get('history', {})
+    stats = {'seeded': 0, 'appended': 0, 'states': 0}
+    tickers = list(history)
+
+    if tickers:
+        coverage = cache.coverage(tickers)
+        for ticker, data in history.items():
+            if not data['dates']:
+                continue
+            covered_from, last_date = coverage.get(ticker, (None, None))
+            if covered_from is None or covered_from > snapshot['covered_from']:
+                cache.write(ticker, _history_frame(data), covered_from=snapshot['covered_from'], replace=True)
+                stats['seeded'] += 1
+            elif last_date < data['dates'][-1]:
+                hist = _history_frame(data)
+                cache.write(ticker, hist[hist.index > pd.Timestamp(last_date)])
+                stats['appended'] += 1
+
+        saved = cache.indicator_states(tickers)
+        coverage = cache.coverage(tickers)
+        states = [
+            (ticker, state['last_date'], json.dumps(state))
+            for ticker, state in snapshot.get('indicator_state', {}).items()
+            if ticker not in saved and coverage.get(ticker, (None, None))[1] == state['last_date']
+        ]
+        if states:
+            cache.save_indicator_states(states)
+            stats['states'] = len(states)
+
+    if own_cache:
+        cache.close()
+    return stats
@@ -0,0 +1,239 @@
+"""
+Intraday watch mode (장중 감시)
+- 감시 종목(watchlist)의 시세를 일정 간격으로 일괄 조회
+- 종목별 지표 상태(indicator_state)에 잠정 봉(현재가/누적 거래량)만 반영해 지표 계산 → 종목당 O(1)
+- 상태가 바뀔 때만 텔레그램 알림: RSI 70/30 돌파, MA20/MA60 교차, 거래량 비율 200% 초과
+- 같은 종목/같은 알림은 ALERT_COOLDOWN 동안 다시 보내지 않음
+
+사용법:
+  python scripts/watch_mode.py
+  python scripts/watch_mode.py --interval 30 --duration 390
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime
+
+from indicator_state import sync_states
+from market_data import download_history
+from ohlcv_cache import OHLCVCache, update_history
+from telegram_delivery import TelegramDelivery
+from universe_snapshot import warm_start
+from watchlist import load_watchlist
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+TELEGRAM_BOT_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN')
+TELEGRAM_CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID')
+
+# 조회 간격 (초)
+WATCH_INTERVAL = int(os.environ.get('WATCH_INTERVAL', '60'))
+
+# 실행 시간 (분, 0이면 중단할 때까지)
+WATCH_DURATION = int(os.environ.get('WATCH_DURATION', '0'))
+
+# 같은 알림 재전송 금지 시간 (분)
+ALERT_COOLDOWN = int(os.environ.get('ALERT_COOLDOWN', '60'))
+
+# 일일 리포트와 같은 기준
+RSI_OVERBOUGHT = 70
+RSI_OVERSOLD = 30
+VOLUME_SPIKE = 200
+
+# 잠정 봉 조회 기간 (휴일/시차가 있어도 마지막 거래일이 포함되도록)
+QUOTE_PERIOD = '5d'
+
+ALERT_MESSAGES = {
+    ('rsi', 'overbought'): "🔥 RSI 과매수 진입 (RSI {rsi:.1f})",
+    ('rsi', 'oversold'): "❄️ RSI 과매도 진입 (RSI {rsi:.1f})",
+    ('ma', 'golden'): "✨ 골든크로스 (MA20 {ma_20:,.2f} > MA60 {ma_60:,.2f})",
+    ('ma', 'dead'): "💀 데드크로스 (MA20 {ma_20:,.2f} < MA60 {ma_60:,.2f})",
+    ('volume', 'spike'): "💥 거래량 급증 ({volume_ratio:.0f}%)",
+}
+
+
+# ============================================================================
+# ALERT STATE
+# ============================================================================
+
+def alert_states(row):
+    """지표 1행 → {'rsi', 'ma', 'volume'} 구간 이름"""
+    if row['rsi'] > RSI_OVERBOUGHT:
+        rsi = 'overbought'
+    elif row['rsi'] < RSI_OVERSOLD:
+        rsi = 'oversold'
+    else:
+        rsi = 'neutral'
+
+    if row['golden_cross']:
+        ma = 'golden'
+    elif row['dead_cross']:
+        ma = 'dead'
+    else:
+        ma = 'flat'
+
+    return {'rsi': rsi, 'ma': ma, 'volume': 'spike' if row['volume_ratio'] > VOLUME_SPIKE else 'normal'}
+
+
+class AlertTracker:
+    """Remember the last state per ticker and report debounced transitions"""
+
+    def __init__(self, cooldown=ALERT_COOLDOWN * 60):
+        self.cooldown = cooldown
+        self.states = {}
+        self.sent = {}
+
+    def baseline(self, ticker, row):
+        """기준 상태 기록 (알림 없음)"""
+        self.states[ticker] = alert_states(row)
+
+    def update(self, ticker, row, now=None):
+        """새 지표 반영 → 알림 보낼 (kind, state) 리스트"""
+        now = time.time() if now is None else now
+        current = alert_states(row)
+        previous = self.states.get(ticker, current)
+        self.states[ticker] = current
+
+        alerts = []
+        for kind, state in current.items():
+            if state == previous[kind] or (kind, state) not in ALERT_MESSAGES:
+                continue
+            key = (ticker, kind, state)
+            if now - self.sent.get(key, float('-inf')) < self.cooldown:
+                continue
+            self.sent[key] = now
+            alerts.append((kind, state))
+        return alerts
+
+
+# ============================================================================
+# POLLING
+# ============================================================================
+
+def load_states(tickers):
+    """일봉 캐시 갱신 후 종목별 지표 상태 → {ticker: IndicatorState}"""
+    cache = OHLCVCache()
+    update_history(tickers, period="1y", cache=cache)
+    states, _ = sync_states(tickers, cache)
+    cache.close()
+    return states
+
+
+def poll(states, tickers):
+    """
+    시세 일괄 조회 → ({ticker: 잠정 봉 반영 지표}, failed)
+    - 조회 기간의 마지막 봉 이전 봉은 확정 봉으로 상태에 반영 (날짜가 바뀐 경우)
+    - 마지막 봉은 상태를 바꾸지 않고 잠정 봉으로만 계산
+    """
+    panel, failed = download_history(tickers, period=QUOTE_PERIOD)
+    rows = {}
+    if panel.empty:
+        return rows, failed
+
+    close, volume = panel['Close'], panel['Volume']
+    dates = close.index.strftime('%Y-%m-%d')
+    for ticker in tickers:
+        state = states.get(ticker)
+        if state is None or ticker not in close.columns:
+            continue
+        valid = close[ticker].notna().to_numpy().nonzero()[0]
+        if len(valid) == 0:
+            continue
+
+        c, v = close[ticker].to_numpy(), volume[ticker].to_numpy()
+        if not all(state.apply(dates[i], c[i], v[i]) for i in valid[:-1]):
+            failed[ticker] = '지표 상태 갱신 실패'
+            continue
+        last = valid[-1]
+        row = state.provisional_row(c[last], v[last], dates[last])
+        if row is not None:
+            rows[ticker] = row
+    return rows, failed
+
+
+def format_alerts(alerts, names):
+    """[(ticker, kind, state, row)] → 텔레그램 메시지"""
+    message = "🚨 장중 알림\n"
+    message += f"🕐 {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
+    message += "━━━━━━━━━━━━━━━\n\n"
+    for ticker, kind, state, row in alerts:
+        message += f"• {names.get(ticker, ticker)} ({ticker}) ${row['price']:,.2f} ({row['change_1d']:+.2f}%)\n"
+        message += f"  {ALERT_MESSAGES[(kind, state)].format(**row)}\n"
+    return message
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='장중 감시 (상태 변화 알림)')
+    parser.add_argument('--interval', type=int, default=WATCH_INTERVAL, help='조회 간격 (초)')
+    parser.add_argument('--duration', type=int, default=WATCH_DURATION, help='실행 시간 (분, 0=무제한)')
+    parser.add_argument('--cooldown', type=int, default=ALERT_COOLDOWN, help='같은 알림 재전송 금지 (분)')
+    args = parser.parse_args()
+
+    print("="*70)
+    print("👀 데이터센터 종목 장중 감시")
+    print("="*70 + "\n")
+
+    stocks, snapshot = load_watchlist()
+    if snapshot:
+        warm_start(snapshot)
+    names = {stock['ticker']: stock['name'] for stock in stocks}
+    tickers = list(names)
+
+    states = load_states(tickers)
+    tracker = AlertTracker(args.cooldown * 60)
+    for ticker, state in states.items():
+        row = state.row()
+        if row is not None:
+            tracker.baseline(ticker, row)
+    print(f"📋 {len(states)}/{len(tickers)}개 종목 감시 (간격 {args.interval}초, "
+          f"재알림 금지 {args.cooldown}분)\n")
+
+    delivery = TelegramDelivery(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID) if TELEGRAM_BOT_TOKEN else None
+    deadline = time.time() + args.duration * 60 if args.duration else None
+    polls = alerts_sent = 0
+
+    try:
+        while deadline is None or time.time() < deadline:
+            start = time.perf_counter()
+            rows, failed = poll(states, tickers)
+            alerts = [
+                (ticker, kind, state, row)
+                for ticker, row in rows.items()
+                for kind, state in tracker.update(ticker, row)
+            ]
+            elapsed = time.perf_counter() - start
+            polls += 1
+
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] 조회 {len(rows)}개, 실패 {len(failed)}개, "
+                  f"알림 {len(alerts)}개 | {elapsed:.2f}초")
+            if alerts:
+                message = format_alerts(alerts, names)
+                print(message)
+                if delivery:
+                    delivery.send_message(message, label=f"장중 알림 {polls}")
+                alerts_sent += len(alerts)
+            if delivery:
+                TelegramDelivery.print_report(delivery.collect())
+
+            time.sleep(max(args.interval - (time.perf_counter() - start), 0))
+    except KeyboardInterrupt:
+        print("\n⏹️ 감시 중단")
+
+    if delivery:
+        TelegramDelivery.print_report(delivery.wait())
+
+    print("\n" + "="*70)
+    print(f"✅ 감시 종료: 조회 {polls}회, 알림 {alerts_sent}개")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Watchlist (일일 리포트 / 장중 감시 대상 종목)
+- 월간 종목 선정 스냅샷(universe_snapshot)이 있으면 그 종목 목록
+- 없으면 기본 목록(DEFAULT_STOCKS)
+"""
+
+from universe_snapshot import load_snapshot, snapshot_stocks
+
+
+# ============================================================================
+# DEFAULT STOCKS
+# ============================================================================
+
+DEFAULT_STOCKS = [
+    {'name': 'NVIDIA', 'ticker': 'NVDA', 'sector': 'AI칩'},
+    {'name': 'AMD', 'ticker': 'AMD', 'sector': 'AI칩'},
+    {'name': 'Intel', 'ticker': 'INTC', 'sector': 'AI칩'},
+    {'name': 'Super Micro', 'ticker': 'SMCI', 'sector': 'AI서버'},
+    {'name': 'Dell', 'ticker': 'DELL', 'sector': 'AI서버'},
+    {'name': 'Vertiv', 'ticker': 'VRT', 'sector': '전력'},
+    {'name': 'Eaton', 'ticker': 'ETN', 'sector': '전력'},
+    {'name': 'LS ELECTRIC', 'ticker': '010120.KS', 'sector': '전력'},
+    {'name': 'Cummins', 'ticker': 'CMI', 'sector': '발전'},
+    {'name': 'Generac', 'ticker': 'GNRC', 'sector': '발전'},
+    {'name': 'Johnson Controls', 'ticker': 'JCI', 'sector': '쿨링'},
+    {'name': 'Trane Tech', 'ticker': 'TT', 'sector': '쿨링'},
+    {'name': 'Arista Networks', 'ticker': 'ANET', 'sector': '네트워크'},
+    {'name': 'Broadcom', 'ticker': 'AVGO', 'sector': '네트워크'},
+    {'name': 'Marvell', 'ticker': 'MRVL', 'sector': '네트워크'},
+    {'name': 'HFR', 'ticker': '230240.KQ', 'sector': '광통신'},
+    {'name': 'Corning', 'ticker': 'GLW', 'sector': '광섬유'},
+    {'name': 'Lumentum', 'ticker': 'LITE', 'sector': '광통신'},
+    {'name': 'SK hynix', 'ticker': '000660.KS', 'sector': 'HBM'},
+    {'name': 'Samsung', 'ticker': '005930.KS', 'sector': 'HBM'},
+    {'name': 'Micron', 'ticker': 'MU', 'sector': 'HBM'},
+    {'name': '한미반도체', 'ticker': '042700.KQ', 'sector': '패키징'},
+    {'name': 'Amkor', 'ticker': 'AMKR', 'sector': '패키징'},
+    {'name': 'Western Digital', 'ticker': 'WDC', 'sector': 'SSD'},
+    {'name': 'Digital Realty', 'ticker': 'DLR', 'sector': 'DC REIT'},
+    {'name': 'Equinix', 'ticker': 'EQIX', 'sector': 'DC REIT'},
+]
+
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def load_watchlist():
+    """(종목 목록 [{'name', 'ticker', 'sector'}], snapshot 또는 None)"""
+    snapshot = load_snapshot()
+    if snapshot:
+        return snapshot_stocks(snapshot), snapshot
+    return DEFAULT_STOCKS, None